@@ -4,15 +4,40 @@ Provides comprehensive web-based administration interface
 """
 
 import os
+import re
 import json
 import logging
+import stat
 import hashlib
+import hmac
 import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from flask import Blueprint, render_template, jsonify, request, session, redirect, url_for, flash
-from functools import wraps
+from flask import Blueprint, Response, make_response, render_template, stream_template, request, session, redirect, url_for, flash
+from functools import lru_cache, wraps
+from operator import itemgetter
+from jinja2 import FileSystemBytecodeCache
+from jinja2.utils import LRUCache
 from database_manager import get_database_manager
 
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+try:
+    import redis
+except ImportError:  # optional; aggregates are cached per process only
+    redis = None
+
+try:
+    from jinja2_htmlmin import minify_loader
+except ImportError:  # optional; templates are served unminified
+    minify_loader = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,34 +48,448 @@ db = get_database_manager()
 # Create Blueprint for admin routes
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Compiled template bytecode is shared across workers and restarts. Unset,
+# Jinja picks a private per-user directory under the system temp dir.
+JINJA_CACHE_DIR = os.environ.get("JINJA_CACHE_DIR")
+JINJA_TEMPLATE_CACHE_SIZE = 1000
+
+def _template_bytecode_cache():
+    """Bytecode cache in a directory only this process's user can write to
+
+    Jinja unmarshals and runs whatever bytecode it finds there, so an
+    explicitly configured directory must be owned by us and closed to
+    group/other writes.
+    """
+    if not JINJA_CACHE_DIR:
+        return FileSystemBytecodeCache()
+    
+    os.makedirs(JINJA_CACHE_DIR, mode=0o700, exist_ok=True)
+    st = os.lstat(JINJA_CACHE_DIR)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+        raise OSError(f"{JINJA_CACHE_DIR} must be a directory owned by this user and not group/world-writable")
+    return FileSystemBytecodeCache(JINJA_CACHE_DIR)
+
+@admin_bp.record_once
+def _configure_template_cache(state):
+    """Skip template mtime checks and reuse compiled bytecode for the admin pages in production"""
+    if get_app_config()['flask_env'] != 'production':
+        return
+    
+    app = state.app
+    app.jinja_env.cache = LRUCache(JINJA_TEMPLATE_CACHE_SIZE)
+    try:
+        app.jinja_env.bytecode_cache = _template_bytecode_cache()
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Template bytecode cache disabled: {e}")
+    
+    # app.run(debug=True) turns reloading back on for development
+    if not app.debug:
+        app.jinja_env.auto_reload = False
+    
+    # Minify once when a template is loaded; the compiled (and bytecode-cached)
+    # template then renders the already-squeezed markup on every request
+    if minify_loader is not None:
+        app.jinja_env.loader = minify_loader(
+            app.jinja_env.loader,
+            remove_comments=True,
+            remove_empty_space=True,
+            reduce_boolean_attributes=True
+        )
+
+def _dumps(obj):
+    """Serialize `obj` to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str).encode()
+
+def ojson(obj, status=200):
+    """Build a JSON response for the admin API (drop-in for jsonify); bytes are sent as-is"""
+    body = obj if isinstance(obj, bytes) else _dumps(obj)
+    return Response(body, status=status, mimetype='application/json')
+
 # Admin authentication
 ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME", "admin")
-ADMIN_PASSWORD_HASH = hashlib.sha256(os.environ.get("ADMIN_PASSWORD", "admin123").encode()).hexdigest()
+ADMIN_PASSWORD_SALT = os.environ.get("ADMIN_PASSWORD_SALT", "").encode() or secrets.token_bytes(16)
+ADMIN_PASSWORD_SCRYPT = {'n': 2 ** 14, 'r': 8, 'p': 1}
+
+def _hash_admin_password(password):
+    """Derive the scrypt verifier for an admin password"""
+    return hashlib.scrypt(password.encode(), salt=ADMIN_PASSWORD_SALT, **ADMIN_PASSWORD_SCRYPT)
+
+# Computed once at import; login only derives the candidate
+ADMIN_PASSWORD_HASH = _hash_admin_password(os.environ.get("ADMIN_PASSWORD", "admin123"))
+
+# Process-local cache for dashboard aggregates
+_cache_lock = threading.Lock()
+_cache_stores = []  # (tags, store, redis prefix) for every ttl_cache-decorated function
+
+# Optional Redis tier shared by every worker process (REDIS_URL)
+REDIS_CACHE_PREFIX = 'admin:'
+_redis_client = None
+
+def get_redis():
+    """Redis client for the shared aggregate cache, or None when Redis is not configured"""
+    global _redis_client
+    if _redis_client is None and redis is not None and os.environ.get('REDIS_URL'):
+        _redis_client = redis.Redis.from_url(os.environ['REDIS_URL'], socket_timeout=0.5)
+    return _redis_client
+
+_NOT_DECODED = object()
+
+def ttl_cache(seconds, tags=(), maxsize=128, shared=False):
+    """Cache an AdminAnalytics method's result for `seconds`, keyed by its arguments.
+    
+    With `shared`, results are also kept in Redis (as JSON) so a worker that
+    misses locally can reuse another worker's aggregate. Shared results are
+    always returned decoded from that JSON, whether the hit was local or came
+    from Redis, so callers see the same types (dates as ISO strings) on every
+    path. Entries can be dropped early with invalidate_cache() using any of
+    `tags`. The encoded JSON of a result is cached alongside it; see
+    cached_json().
+    """
+    def decorator(f):
+        store = OrderedDict()
+        prefix = f"{REDIS_CACHE_PREFIX}{f.__name__}:" if shared else None
+        _cache_stores.append((frozenset(tags), store, prefix))
+        
+        def get_entry(self, args, kwargs):
+            """[expires, result, payload]; result or payload is filled in lazily"""
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with _cache_lock:
+                entry = store.get(key)
+                if entry and entry[0] > now:
+                    store.move_to_end(key)
+                    return entry
+            
+            entry = [now + seconds, _NOT_DECODED, None]
+            redis_client = get_redis() if shared else None
+            redis_key = f"{prefix}{key!r}"
+            if redis_client is not None:
+                try:
+                    entry[2] = redis_client.get(redis_key)
+                except Exception as e:
+                    logger.warning(f"Redis cache read failed for {redis_key}: {e}")
+            
+            if entry[2] is None:
+                entry[1] = f(self, *args, **kwargs)
+                if shared:
+                    # Keep only the payload so the local path decodes it like a Redis hit
+                    entry[1], entry[2] = _NOT_DECODED, _dumps(entry[1])
+                if redis_client is not None:
+                    try:
+                        redis_client.setex(redis_key, seconds, entry[2])
+                    except Exception as e:
+                        logger.warning(f"Redis cache write failed for {redis_key}: {e}")
+            
+            with _cache_lock:
+                store[key] = entry
+                store.move_to_end(key)
+                while len(store) > maxsize:
+                    store.popitem(last=False)
+            return entry
+        
+        @wraps(f)
+        def wrapper(self, *args, **kwargs):
+            entry = get_entry(self, args, kwargs)
+            if entry[1] is _NOT_DECODED:
+                entry[1] = json.loads(entry[2])
+            return entry[1]
+        
+        def encoded(self, *args, **kwargs):
+            entry = get_entry(self, args, kwargs)
+            if entry[2] is None:
+                entry[2] = _dumps(entry[1])
+            return entry[2]
+        
+        wrapper.encoded = encoded
+        return wrapper
+    return decorator
+
+def cached_json(method, *args, **kwargs):
+    """JSON bytes for a ttl_cache'd AdminAnalytics method call, encoded once per cache entry"""
+    return method.encoded(method.__self__, *args, **kwargs)
+
+def invalidate_cache(tag=None):
+    """Drop cached results tagged with `tag` (or everything when no tag is given)"""
+    prefixes = []
+    with _cache_lock:
+        for tags, store, prefix in _cache_stores:
+            if tag is None or tag in tags:
+                store.clear()
+                if prefix:
+                    prefixes.append(prefix)
+    
+    redis_client = get_redis()
+    if redis_client is not None and prefixes:
+        try:
+            for prefix in prefixes:
+                keys = list(redis_client.scan_iter(match=f"{prefix}*"))
+                if keys:
+                    redis_client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis cache invalidation failed: {e}")
+
+# Accepted values when the admin changes a user's tier
+_VALID_TIERS = frozenset(('free', 'premium', 'enterprise'))
+# E.164-style numbers as stored in users.phone_number
+_PHONE_RE = re.compile(r'^\+?\d{7,15}$')
+
+# Error messages and request text are cut to this many characters in list views
+ERROR_PREVIEW_CHARS = 100
+
+# Trailing windows reported by AdminAnalytics.get_health_snapshot()
+HEALTH_BUCKETS = (
+    ('5m', {'minutes': 5}),
+    ('10m', {'minutes': 10}),
+    ('1h', {'hours': 1}),
+    ('24h', {'hours': 24}),
+    ('7d', {'days': 7}),
+)
+SLOW_TASK_SECONDS = 30
+
+# Background refresh of the daily_task_stats rollup and the hourly materialized views
+ROLLUP_REFRESH_INTERVAL = 600  # seconds
+HOURLY_ROLLUP_REFRESH_INTERVAL = 60  # seconds
+# Every worker runs the refresher; these transaction-scoped advisory locks let
+# one of them do each refresh while the others skip it
+DAILY_ROLLUP_LOCK_ID = 0x61646d01
+HOURLY_ROLLUP_LOCK_ID = 0x61646d02
+_rollup_thread = None
+_rollup_lock = threading.Lock()
+
+def start_rollup_refresher(interval=ROLLUP_REFRESH_INTERVAL):
+    """Start the daemon thread that keeps the rollups current (idempotent)"""
+    global _rollup_thread
+    with _rollup_lock:
+        if _rollup_thread is None:
+            _rollup_thread = threading.Thread(
+                target=_rollup_refresh_loop, args=(interval,),
+                name='admin-rollup-refresher', daemon=True
+            )
+            _rollup_thread.start()
+
+def _rollup_refresh_loop(interval):
+    """Refresh the hourly views every minute; backfill daily_task_stats once, then
+    re-aggregate its last two days every `interval` seconds.
+    
+    A refresh another worker is already running is skipped (see the advisory
+    locks), so the backfill is only done by whichever worker gets there first.
+    """
+    analytics = get_analytics()
+    backfilled = False
+    next_daily_refresh = 0
+    while True:
+        try:
+            analytics.refresh_hourly_rollups()
+        except Exception as e:
+            logger.warning(f"Error refreshing hourly rollups: {e}")
+        
+        if time.monotonic() >= next_daily_refresh:
+            try:
+                analytics.refresh_daily_task_stats(days=2 if backfilled else None)
+                backfilled = True
+                next_daily_refresh = time.monotonic() + interval
+            except Exception as e:
+                logger.warning(f"Error refreshing daily task stats: {e}")
+        time.sleep(HOURLY_ROLLUP_REFRESH_INTERVAL)
+
+# Live dashboard snapshot pushed to Server-Sent Events subscribers
+SNAPSHOT_REFRESH_INTERVAL = 5  # seconds
+_snapshot = {'version': 0, 'data': None}
+_snapshot_changed = threading.Condition()
+_snapshot_thread = None
+
+def start_snapshot_refresher(interval=SNAPSHOT_REFRESH_INTERVAL):
+    """Start the daemon thread that publishes the dashboard snapshot (idempotent)"""
+    global _snapshot_thread
+    with _snapshot_changed:
+        if _snapshot_thread is None:
+            _snapshot_thread = threading.Thread(
+                target=_snapshot_refresh_loop, args=(interval,),
+                name='admin-snapshot-refresher', daemon=True
+            )
+            _snapshot_thread.start()
+
+def _snapshot_refresh_loop(interval):
+    """Rebuild the snapshot from the cached aggregates and wake every subscriber"""
+    analytics = get_analytics()
+    while True:
+        try:
+            data = _dumps({
+                'overview': analytics.get_system_overview(),
+                'system_health': analytics.get_system_health(),
+                'timestamp': _iso_now()
+            }).decode()
+            with _snapshot_changed:
+                _snapshot['version'] += 1
+                _snapshot['data'] = data
+                _snapshot_changed.notify_all()
+        except Exception as e:
+            logger.warning(f"Error refreshing dashboard snapshot: {e}")
+        time.sleep(interval)
+
+# Database settings and connectivity shown on the system config page
+SYSTEM_STATUS_REFRESH_INTERVAL = 10  # seconds
+_system_status = {}
+_system_status_lock = threading.Lock()
+_system_status_thread = None
+
+def start_system_status_refresher(interval=SYSTEM_STATUS_REFRESH_INTERVAL):
+    """Start the daemon thread that probes the database and Redis (idempotent)"""
+    global _system_status_thread
+    with _system_status_lock:
+        if _system_status_thread is None:
+            _system_status_thread = threading.Thread(
+                target=_system_status_refresh_loop, args=(interval,),
+                name='admin-system-status-refresher', daemon=True
+            )
+            _system_status_thread.start()
+
+def _refresh_system_status():
+    """Probe the database and Redis once and publish the result"""
+    status = get_analytics().get_system_status()
+    with _system_status_lock:
+        _system_status.update(status)
+    return status
+
+def _system_status_refresh_loop(interval):
+    """Keep the system status snapshot current so requests never probe on their own"""
+    while True:
+        try:
+            _refresh_system_status()
+        except Exception as e:
+            logger.warning(f"Error refreshing system status: {e}")
+        time.sleep(interval)
+
+def get_system_status():
+    """Latest system status snapshot (probes once if the refresher has not run yet)"""
+    start_system_status_refresher()
+    with _system_status_lock:
+        if _system_status:
+            return dict(_system_status)
+    return _refresh_system_status()
+
+# Page panels are loaded concurrently; kept small so page loads cannot exhaust the DB pool
+_panel_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='admin-panel')
+
+def _load_panels(**loaders):
+    """Run independent panel loaders in parallel and return their results by name"""
+    futures = {name: _panel_executor.submit(loader) for name, loader in loaders.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+def _cutoff(**delta):
+    """UTC timestamp `delta` before now, bound as a parameter instead of NOW() - INTERVAL"""
+    return datetime.utcnow() - timedelta(**delta)
+
+def _today():
+    """Midnight at the start of the current UTC day"""
+    return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+@lru_cache(maxsize=2)
+def _iso_second(second):
+    return datetime.fromtimestamp(second).isoformat()
+
+def _iso_now():
+    """Local-time ISO timestamp for API responses, formatted once per second"""
+    return _iso_second(int(time.time()))
+
+def _hour_series(since):
+    """First and last hour bucket covering `since` up to now, for generate_series"""
+    return (since.replace(minute=0, second=0, microsecond=0),
+            datetime.utcnow().replace(minute=0, second=0, microsecond=0))
+
+def _date_range_bounds(start_date, end_date):
+    """Convert an inclusive start/end date pair into a half-open [start, end) range.
+    
+    Date-only end values are bumped to the following midnight so the whole
+    last day is included while `created_at` stays directly comparable to
+    the index.
+    """
+    range_start = datetime.fromisoformat(start_date)
+    range_end = datetime.fromisoformat(end_date)
+    if len(end_date) == 10:
+        range_end += timedelta(days=1)
+    return range_start, range_end
+
+@lru_cache(maxsize=1)
+def get_app_config():
+    """Application configuration shown on the system page (environment is read once per process)"""
+    return {
+        'admin_username': os.environ.get('ADMIN_USERNAME', 'admin'),
+        'flask_env': os.environ.get('FLASK_ENV', 'production'),
+        'database_url': 'Configured' if os.environ.get('DATABASE_URL') else 'Not configured',
+        'redis_url': 'Configured' if os.environ.get('REDIS_URL') else 'Not configured',
+        'twilio_configured': bool(os.environ.get('TWILIO_ACCOUNT_SID')),
+        'openai_configured': bool(os.environ.get('OPENAI_API_KEY')),
+        'rate_limits': {
+            'free': os.environ.get('RATE_LIMIT_FREE', '10'),
+            'premium': os.environ.get('RATE_LIMIT_PREMIUM', '100'),
+            'enterprise': os.environ.get('RATE_LIMIT_ENTERPRISE', '1000')
+        },
+        'features': {
+            'backup_enabled': bool(os.environ.get('BACKUP_ENABLED', True)),
+            'analytics_enabled': bool(os.environ.get('ANALYTICS_ENABLED', True)),
+            'rate_limiting_enabled': bool(os.environ.get('RATE_LIMITING_ENABLED', True)),
+            'error_tracking_enabled': bool(os.environ.get('ERROR_TRACKING_ENABLED', True))
+        }
+    }
 
 def require_auth(f):
     """Decorator to require authentication for admin routes"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'admin_authenticated' not in session or not session['admin_authenticated']:
+        if not session.get('admin_authenticated'):
             return redirect(url_for('admin.login'))
         return f(*args, **kwargs)
     return decorated_function
 
-@admin_bp.route('/debug-bypass')
-def debug_bypass():
-    """Temporary route to bypass authentication for testing"""
-    session['admin_authenticated'] = True
-    session['admin_user'] = 'debug'
-    return redirect(url_for('admin.dashboard'))
-
-@admin_bp.route('/debug-session')
-def debug_session():
-    """Debug route to check session status"""
-    return jsonify({
-        'session_data': dict(session),
-        'authenticated': session.get('admin_authenticated', False),
-        'user': session.get('admin_user', None)
-    })
+# Read-only aggregates change on the order of minutes; let the browser revalidate
+API_CACHE_MAX_AGE = 30  # seconds
+
+def etagged(f):
+    """Decorator adding a content ETag and a short private Cache-Control to JSON endpoints.
+    
+    A matching If-None-Match gets an empty 304 instead of the body. A view
+    may return a plain dict: the ETag then covers the dict alone and the
+    response gets a ``timestamp`` added afterwards, so a per-second
+    timestamp does not change the ETag on every request.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        result = f(*args, **kwargs)
+        if isinstance(result, dict):
+            body = _dumps(result)
+            response = ojson({**result, 'timestamp': _iso_now()})
+        else:
+            response = make_response(result)
+            body = response.get_data()
+        if response.status_code != 200:
+            return response
+        
+        response.set_etag(hashlib.blake2s(body, digest_size=8).hexdigest())
+        response.cache_control.private = True
+        response.cache_control.max_age = API_CACHE_MAX_AGE
+        return response.make_conditional(request)
+    return decorated_function
+
+# The auth bypass must never be reachable outside a development checkout
+if get_app_config()['flask_env'] == 'development':
+    @admin_bp.route('/debug-bypass')
+    def debug_bypass():
+        """Temporary route to bypass authentication for testing"""
+        session['admin_authenticated'] = True
+        session['admin_user'] = 'debug'
+        return redirect(url_for('admin.dashboard'))
+
+    @admin_bp.route('/debug-session')
+    def debug_session():
+        """Debug route to check session status"""
+        return ojson({
+            'session_data': dict(session),
+            'authenticated': session.get('admin_authenticated', False),
+            'user': session.get('admin_user', None)
+        })
 
 @admin_bp.route('/login', methods=['GET', 'POST'])
 def login():
@@ -59,7 +498,12 @@ def login():
         username = request.form.get('username')
         password = request.form.get('password')
         
-        if username == ADMIN_USERNAME and hashlib.sha256(password.encode()).hexdigest() == ADMIN_PASSWORD_HASH:
+        # Always derive the hash and evaluate both checks so response time
+        # does not reveal which field was wrong
+        user_ok = hmac.compare_digest((username or '').encode(), ADMIN_USERNAME.encode())
+        password_ok = hmac.compare_digest(_hash_admin_password(password or ''), ADMIN_PASSWORD_HASH)
+        
+        if user_ok & password_ok:
             session['admin_authenticated'] = True
             session['admin_user'] = username
             return redirect(url_for('admin.dashboard'))
@@ -82,25 +526,23 @@ def logout():
 @require_auth
 def dashboard():
     """Main admin dashboard"""
-    analytics = AdminAnalytics()
+    analytics = get_analytics()
     
-    # Get overview statistics
-    overview = analytics.get_system_overview()
-    user_analytics = analytics.get_user_analytics(7)  # Last 7 days
-    task_analytics = analytics.get_task_analytics(7)  # Last 7 days
-    system_health = analytics.get_system_health()
+    # Get overview statistics; the four panels query independently
+    panels = _load_panels(
+        overview=analytics.get_system_overview,
+        user_analytics=lambda: analytics.get_user_analytics(7),  # Last 7 days
+        task_analytics=lambda: analytics.get_task_analytics(7),  # Last 7 days
+        system_health=analytics.get_system_health
+    )
     
-    return render_template('admin/dashboard.html', 
-                         overview=overview,
-                         user_analytics=user_analytics,
-                         task_analytics=task_analytics,
-                         system_health=system_health)
+    return render_template('admin/dashboard.html', **panels)
 
 @admin_bp.route('/users')
 @require_auth
 def users():
     """User management page"""
-    analytics = AdminAnalytics()
+    analytics = get_analytics()
     page = request.args.get('page', 1, type=int)
     search = request.args.get('search', '')
     tier_filter = request.args.get('tier', '')
@@ -116,40 +558,43 @@ def users():
 @require_auth
 def analytics():
     """Analytics and reporting page"""
-    analytics = AdminAnalytics()
+    analytics = get_analytics()
     
     # Get date range from query parameters
     days = request.args.get('days', 30, type=int)
     
-    user_analytics = analytics.get_user_analytics(days)
-    task_analytics = analytics.get_task_analytics(days)
+    panels = _load_panels(
+        user_analytics=lambda: analytics.get_user_analytics(days),
+        task_analytics=lambda: analytics.get_task_analytics(days)
+    )
     
-    return render_template('admin/analytics.html', 
-                         user_analytics=user_analytics,
-                         task_analytics=task_analytics,
-                         days=days)
+    # Stream the page so the first bytes go out while Jinja renders the
+    # per-day and per-category tables instead of buffering the whole body
+    return stream_template('admin/analytics.html', 
+                         days=days,
+                         **panels)
 
 @admin_bp.route('/system')
 @require_auth
 def system():
     """System monitoring and configuration"""
-    analytics = AdminAnalytics()
+    analytics = get_analytics()
     
-    system_health = analytics.get_system_health()
-    overview = analytics.get_system_overview()
+    panels = _load_panels(
+        system_health=analytics.get_system_health,
+        overview=analytics.get_system_overview
+    )
     
-    return render_template('admin/system.html',
-                         system_health=system_health,
-                         overview=overview)
+    return render_template('admin/system.html', **panels)
 
 # API Routes for AJAX calls
 @admin_bp.route('/api/overview')
 @require_auth
+@etagged
 def api_overview():
     """API endpoint for dashboard overview data"""
-    analytics = AdminAnalytics()
-    overview = analytics.get_system_overview()
-    return jsonify(overview)
+    analytics = get_analytics()
+    return ojson(cached_json(analytics.get_system_overview))
 
 @admin_bp.route('/api/users')
 @require_auth
@@ -159,35 +604,72 @@ def api_users():
     per_page = request.args.get('per_page', 20, type=int)
     search = request.args.get('search', '')
     tier_filter = request.args.get('tier', '')
+    cursor = request.args.get('cursor')
+    
+    if cursor:
+        sort_key, _, phone_number = cursor.partition('|')
+        try:
+            datetime.fromisoformat(sort_key)
+        except ValueError:
+            return ojson({'error': 'Invalid cursor'}), 400
+        if not phone_number:
+            return ojson({'error': 'Invalid cursor'}), 400
     
-    analytics = AdminAnalytics()
-    users_data = analytics.get_users_list(page=page, per_page=per_page, search=search, tier_filter=tier_filter)
+    analytics = get_analytics()
+    users_data = analytics.get_users_list(page=page, per_page=per_page, search=search, tier_filter=tier_filter,
+                                          cursor=cursor)
     
-    return jsonify(users_data)
+    return ojson(users_data)
 
 @admin_bp.route('/api/analytics/users/<int:days>')
 @require_auth
+@etagged
 def api_user_analytics(days):
     """API endpoint for user analytics"""
-    analytics = AdminAnalytics()
-    user_data = analytics.get_user_analytics(days)
-    return jsonify(user_data)
+    analytics = get_analytics()
+    return ojson(cached_json(analytics.get_user_analytics, days))
 
 @admin_bp.route('/api/analytics/tasks/<int:days>')
 @require_auth
+@etagged
 def api_task_analytics(days):
     """API endpoint for task analytics"""
-    analytics = AdminAnalytics()
-    task_data = analytics.get_task_analytics(days)
-    return jsonify(task_data)
+    analytics = get_analytics()
+    return ojson(cached_json(analytics.get_task_analytics, days))
 
 @admin_bp.route('/api/system/health')
 @require_auth
+@etagged
 def api_system_health():
     """API endpoint for system health"""
-    analytics = AdminAnalytics()
-    health_data = analytics.get_system_health()
-    return jsonify(health_data)
+    analytics = get_analytics()
+    return ojson(cached_json(analytics.get_system_health))
+
+@admin_bp.route('/api/analytics/stream')
+@require_auth
+def api_analytics_stream():
+    """Server-Sent Events stream of the dashboard overview and health snapshot"""
+    start_snapshot_refresher()
+    
+    def generate():
+        seen = 0
+        while True:
+            with _snapshot_changed:
+                if _snapshot['version'] == seen:
+                    # Time out periodically so dead clients are noticed on the next write
+                    _snapshot_changed.wait(timeout=SNAPSHOT_REFRESH_INTERVAL * 3)
+                version, data = _snapshot['version'], _snapshot['data']
+            
+            if version == seen or data is None:
+                yield ": keepalive\n\n"
+                continue
+            seen = version
+            yield f"data: {data}\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 @admin_bp.route('/api/users/tier', methods=['POST'])
 @require_auth
@@ -199,23 +681,58 @@ def api_update_user_tier():
         new_tier = data.get('tier')
         
         if not phone_number or not new_tier:
-            return jsonify({'error': 'Phone number and tier are required'}), 400
+            return ojson({'error': 'Phone number and tier are required'}), 400
+        
+        if new_tier not in _VALID_TIERS:
+            return ojson({'error': 'Invalid tier'}), 400
         
-        if new_tier not in ['free', 'premium', 'enterprise']:
-            return jsonify({'error': 'Invalid tier'}), 400
+        if not _PHONE_RE.match(str(phone_number)):
+            return ojson({'error': 'Invalid phone number'}), 400
         
         # Update user tier in database
-        db.execute_query("""
-            UPDATE users 
-            SET tier = %s 
-            WHERE phone_number = %s
-        """, (new_tier, phone_number), fetch='none')
+        analytics = get_analytics()
+        analytics.update_user_tier(phone_number, new_tier)
         
-        return jsonify({'success': True, 'message': 'User tier updated successfully'})
+        return ojson({'success': True, 'message': 'User tier updated successfully'})
         
     except Exception as e:
         logger.error(f"Error updating user tier: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojson({'error': 'Internal server error'}), 500
+
+@admin_bp.route('/api/users/tier/batch', methods=['POST'])
+@require_auth
+def api_update_user_tiers():
+    """API endpoint to update many user tiers in one transaction"""
+    try:
+        data = request.get_json()
+        
+        if not isinstance(data, list) or not data:
+            return ojson({'error': 'A list of {phone_number, tier} updates is required'}), 400
+        
+        updates = []
+        for item in data:
+            phone_number = item.get('phone_number') if isinstance(item, dict) else None
+            new_tier = item.get('tier') if isinstance(item, dict) else None
+            
+            if not phone_number or not new_tier:
+                return ojson({'error': 'Phone number and tier are required'}), 400
+            
+            if new_tier not in _VALID_TIERS:
+                return ojson({'error': 'Invalid tier'}), 400
+            
+            if not _PHONE_RE.match(str(phone_number)):
+                return ojson({'error': 'Invalid phone number'}), 400
+            
+            updates.append((phone_number, new_tier))
+        
+        analytics = get_analytics()
+        updated = analytics.update_user_tiers(updates)
+        
+        return ojson({'success': True, 'message': f'{updated} user tiers updated successfully', 'updated': updated})
+        
+    except Exception as e:
+        logger.error(f"Error updating user tiers: {e}")
+        return ojson({'error': 'Internal server error'}), 500
 
 @admin_bp.route('/api/users/message', methods=['POST'])
 @require_auth
@@ -227,135 +744,32 @@ def api_send_user_message():
         message = data.get('message')
         
         if not phone_number or not message:
-            return jsonify({'error': 'Phone number and message are required'}), 400
+            return ojson({'error': 'Phone number and message are required'}), 400
         
         # Here you would integrate with your notification system
         # For now, just return success
-        return jsonify({'success': True, 'message': 'Message sent successfully'})
+        return ojson({'success': True, 'message': 'Message sent successfully'})
         
     except Exception as e:
         logger.error(f"Error sending message: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojson({'error': 'Internal server error'}), 500
 
 @admin_bp.route('/api/users/stats')
 @require_auth
 def api_users_stats():
     """API endpoint for user statistics"""
     try:
-        analytics = AdminAnalytics()
-        
-        # Get user statistics with better error handling
-        try:
-            user_stats = analytics.db.execute_query("""
-                SELECT 
-                    COUNT(*) as total_users,
-                    COUNT(CASE WHEN tier = 'free' THEN 1 END) as free_users,
-                    COUNT(CASE WHEN tier = 'premium' THEN 1 END) as premium_users,
-                    COUNT(CASE WHEN tier = 'enterprise' THEN 1 END) as enterprise_users,
-                    COUNT(CASE WHEN created_at >= NOW() - INTERVAL '7 days' THEN 1 END) as new_users_week,
-                    COUNT(CASE WHEN created_at >= NOW() - INTERVAL '30 days' THEN 1 END) as new_users_month,
-                    COUNT(CASE WHEN last_active >= NOW() - INTERVAL '24 hours' THEN 1 END) as active_24h,
-                    COUNT(CASE WHEN last_active >= NOW() - INTERVAL '7 days' THEN 1 END) as active_7d,
-                    COUNT(CASE WHEN last_active >= NOW() - INTERVAL '30 days' THEN 1 END) as active_30d
-                FROM users
-            """, fetch='one')
-            
-            if not user_stats:
-                user_stats = {
-                    'total_users': 0,
-                    'free_users': 0,
-                    'premium_users': 0,
-                    'enterprise_users': 0,
-                    'new_users_week': 0,
-                    'new_users_month': 0,
-                    'active_24h': 0,
-                    'active_7d': 0,
-                    'active_30d': 0
-                }
-        except Exception as e:
-            logger.warning(f"Error getting user stats: {e}")
-            user_stats = {
-                'total_users': 0,
-                'free_users': 0,
-                'premium_users': 0,
-                'enterprise_users': 0,
-                'new_users_week': 0,
-                'new_users_month': 0,
-                'active_24h': 0,
-                'active_7d': 0,
-                'active_30d': 0
-            }
-        
-        # Get user growth over time (last 30 days)
-        try:
-            growth_data = analytics.db.execute_query("""
-                SELECT 
-                    DATE(created_at) as date,
-                    COUNT(*) as new_users
-                FROM users
-                WHERE created_at >= NOW() - INTERVAL '30 days'
-                GROUP BY DATE(created_at)
-                ORDER BY date
-            """)
-            
-            if not growth_data:
-                growth_data = []
-        except Exception as e:
-            logger.warning(f"Error getting user growth data: {e}")
-            growth_data = []
-        
-        # Get user activity by tier
-        try:
-            tier_activity = analytics.db.execute_query("""
-                SELECT 
-                    u.tier,
-                    COUNT(DISTINCT u.phone_number) as user_count,
-                    COALESCE(COUNT(t.id), 0) as total_tasks,
-                    COALESCE(AVG(t.processing_time), 0) as avg_processing_time,
-                    COUNT(CASE WHEN t.success = true THEN 1 END) as successful_tasks
-                FROM users u
-                LEFT JOIN tasks t ON u.phone_number = t.user_phone 
-                    AND t.created_at >= NOW() - INTERVAL '30 days'
-                GROUP BY u.tier
-                ORDER BY user_count DESC
-            """)
-            
-            if not tier_activity:
-                tier_activity = []
-        except Exception as e:
-            logger.warning(f"Error getting tier activity: {e}")
-            tier_activity = []
+        analytics = get_analytics()
+        user_stats = analytics.get_user_stats()
         
-        # Get recent user registrations
-        try:
-            recent_users = analytics.db.execute_query("""
-                SELECT 
-                    phone_number,
-                    tier,
-                    created_at,
-                    last_active
-                FROM users
-                ORDER BY created_at DESC
-                LIMIT 10
-            """)
-            
-            if not recent_users:
-                recent_users = []
-        except Exception as e:
-            logger.warning(f"Error getting recent users: {e}")
-            recent_users = []
-        
-        return jsonify({
-            'user_stats': user_stats,
-            'growth_data': growth_data,
-            'tier_activity': tier_activity,
-            'recent_users': recent_users,
-            'timestamp': datetime.now().isoformat()
+        return ojson({
+            **user_stats,
+            'timestamp': _iso_now()
         })
         
     except Exception as e:
         logger.error(f"Error getting user stats: {e}")
-        return jsonify({
+        return ojson({
             'user_stats': {
                 'total_users': 0,
                 'free_users': 0,
@@ -370,7 +784,7 @@ def api_users_stats():
             'growth_data': [],
             'tier_activity': [],
             'recent_users': [],
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _iso_now(),
             'error': 'Failed to fetch user statistics'
         }), 200
 
@@ -382,376 +796,106 @@ def api_detailed_analytics():
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        analytics = AdminAnalytics()
+        analytics = get_analytics()
         
         # Validate dates
         if not start_date or not end_date:
-            return jsonify({'error': 'start_date and end_date are required'}), 400
-        
-        # Task analytics for date range
-        task_analytics = analytics.db.execute_query("""
-            SELECT 
-                DATE(created_at) as date,
-                COUNT(*) as total_tasks,
-                COUNT(CASE WHEN success = true THEN 1 END) as successful_tasks,
-                COUNT(CASE WHEN success = false THEN 1 END) as failed_tasks,
-                AVG(processing_time) as avg_processing_time,
-                AVG(tokens_used) as avg_tokens_used,
-                AVG(complexity_score) as avg_complexity
-            FROM tasks
-            WHERE created_at >= %s AND created_at <= %s
-            GROUP BY DATE(created_at)
-            ORDER BY date
-        """, (start_date, end_date)) or []
+            return ojson({'error': 'start_date and end_date are required'}), 400
         
-        # Category breakdown
-        category_analytics = analytics.db.execute_query("""
-            SELECT 
-                category,
-                COUNT(*) as task_count,
-                AVG(processing_time) as avg_processing_time,
-                AVG(complexity_score) as avg_complexity,
-                COUNT(CASE WHEN success = true THEN 1 END) as successful_tasks,
-                COUNT(CASE WHEN success = false THEN 1 END) as failed_tasks
-            FROM tasks
-            WHERE created_at >= %s AND created_at <= %s
-            GROUP BY category
-            ORDER BY task_count DESC
-        """, (start_date, end_date)) or []
-        
-        # User activity for date range
-        user_activity = analytics.db.execute_query("""
-            SELECT 
-                u.tier,
-                COUNT(DISTINCT u.phone_number) as active_users,
-                COUNT(t.id) as total_tasks,
-                AVG(t.processing_time) as avg_processing_time
-            FROM users u
-            JOIN tasks t ON u.phone_number = t.user_phone
-            WHERE t.created_at >= %s AND t.created_at <= %s
-            GROUP BY u.tier
-        """, (start_date, end_date)) or []
-        
-        # Performance metrics
-        performance_metrics = analytics.db.execute_query("""
-            SELECT 
-                COUNT(*) as total_tasks,
-                AVG(processing_time) as avg_processing_time,
-                MIN(processing_time) as min_processing_time,
-                MAX(processing_time) as max_processing_time,
-                PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY processing_time) as median_processing_time,
-                PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY processing_time) as p95_processing_time,
-                AVG(tokens_used) as avg_tokens_used,
-                COUNT(CASE WHEN processing_time > 10 THEN 1 END) as slow_tasks
-            FROM tasks
-            WHERE created_at >= %s AND created_at <= %s
-        """, (start_date, end_date), fetch='one') or {}
+        try:
+            range_start, range_end = _date_range_bounds(start_date, end_date)
+        except ValueError:
+            return ojson({'error': 'start_date and end_date must be ISO dates'}), 400
         
-        return jsonify({
-            'date_range': {
-                'start_date': start_date,
-                'end_date': end_date
-            },
-            'task_analytics': task_analytics,
-            'category_analytics': category_analytics,
-            'user_activity': user_activity,
-            'performance_metrics': performance_metrics
-        })
+        # PostgreSQL builds the whole JSON document; it is sent to the client as-is
+        payload = analytics.get_detailed_analytics(range_start, range_end, start_date, end_date)
+        return Response(payload, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error getting detailed analytics: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojson({'error': 'Internal server error'}), 500
 
 @admin_bp.route('/api/system/performance')
 @require_auth
+@etagged
 def api_system_performance():
     """API endpoint for system performance metrics"""
     try:
-        analytics = AdminAnalytics()
+        analytics = get_analytics()
+        # ?deep=1 asks the server (pg_stat_activity) instead of the local pool
+        performance = analytics.get_performance_metrics(deep=request.args.get('deep') == '1')
         
-        # Get basic performance metrics - handle empty results
-        try:
-            performance_metrics = analytics.db.execute_query("""
-                SELECT 
-                    COUNT(*) as total_tasks,
-                    COALESCE(AVG(processing_time), 0) as avg_processing_time,
-                    COUNT(CASE WHEN processing_time > 10 THEN 1 END) as slow_tasks
-                FROM tasks
-                WHERE created_at >= NOW() - INTERVAL '24 hours'
-            """, fetch='one')
-            
-            if not performance_metrics:
-                performance_metrics = {
-                    'total_tasks': 0,
-                    'avg_processing_time': 0,
-                    'slow_tasks': 0
-                }
-        except Exception as e:
-            logger.warning(f"Error getting performance metrics: {e}")
-            performance_metrics = {
+        # etagged adds the timestamp outside the ETag
+        return performance
+        
+    except Exception as e:
+        logger.error(f"Error getting system performance: {e}")
+        return ojson({
+            'performance_metrics': {
                 'total_tasks': 0,
                 'avg_processing_time': 0,
                 'slow_tasks': 0
-            }
+            },
+            'performance_trends': [],
+            'database_size': 'Unknown',
+            'table_counts': {},
+            'connection_stats': {
+                'total_connections': 0,
+                'active_connections': 0,
+                'idle_connections': 0
+            },
+            'timestamp': _iso_now(),
+            'error': 'Failed to fetch performance data'
+        }), 200  # Return 200 with error message instead of 500
+
+@admin_bp.route('/api/system/errors')
+@require_auth
+def api_system_errors():
+    """API endpoint for system error logs and statistics"""
+    try:
+        analytics = get_analytics()
         
-        # Get recent performance trends - handle empty results
-        try:
-            performance_trends = analytics.db.execute_query("""
-                SELECT 
-                    DATE_TRUNC('hour', created_at) as hour,
-                    COUNT(*) as task_count,
-                    COALESCE(AVG(processing_time), 0) as avg_processing_time
-                FROM tasks
-                WHERE created_at >= NOW() - INTERVAL '24 hours'
-                GROUP BY DATE_TRUNC('hour', created_at)
-                ORDER BY hour
-            """)
-            
-            if not performance_trends:
-                performance_trends = []
-        except Exception as e:
-            logger.warning(f"Error getting performance trends: {e}")
-            performance_trends = []
+        # Get recent errors (last 24 hours), paged by (timestamp, id)
+        limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+        before = request.args.get('before')
+        if before:
+            before_ts, _, before_id = before.partition('|')
+            try:
+                before = (datetime.fromisoformat(before_ts), int(before_id))
+            except ValueError:
+                return ojson({'error': 'Invalid cursor'}), 400
         
-        # Get database size safely
-        try:
-            db_size_result = analytics.db.execute_query("""
-                SELECT pg_size_pretty(pg_database_size(current_database())) as size
-            """, fetch='one')
-            db_size = db_size_result.get('size', 'Unknown') if db_size_result else 'Unknown'
-        except Exception as e:
-            logger.warning(f"Error getting database size: {e}")
-            db_size = 'Unknown'
+        recent_errors = analytics.get_recent_errors(hours=24, limit=limit, before=before)
+        next_cursor = None
+        if len(recent_errors) == limit:
+            last = recent_errors[-1]
+            next_cursor = f"{last['timestamp'].isoformat()}|{last['id']}"
         
-        # Get table counts safely
-        table_counts = {}
-        try:
-            table_data = analytics.db.execute_query("""
-                SELECT 
-                    schemaname,
-                    relname as table_name,
-                    COALESCE(n_live_tup, 0) as row_count
-                FROM pg_stat_user_tables
-                WHERE schemaname = 'public'
-                ORDER BY relname
-            """)
-            
-            if table_data:
-                for table in table_data:
-                    table_counts[table['table_name']] = table['row_count']
-        except Exception as e:
-            logger.warning(f"Error getting table counts: {e}")
-            table_counts = {}
+        error_summary = analytics.get_error_summary()
         
-        # Get connection stats safely
-        try:
-            connection_stats = analytics.db.execute_query("""
-                SELECT 
-                    COUNT(*) as total_connections,
-                    COUNT(CASE WHEN state = 'active' THEN 1 END) as active_connections,
-                    COUNT(CASE WHEN state = 'idle' THEN 1 END) as idle_connections
-                FROM pg_stat_activity
-                WHERE datname = current_database()
-            """, fetch='one')
-            
-            if not connection_stats:
-                connection_stats = {
-                    'total_connections': 0,
-                    'active_connections': 0,
-                    'idle_connections': 0
-                }
-        except Exception as e:
-            logger.warning(f"Error getting connection stats: {e}")
-            connection_stats = {
-                'total_connections': 0,
-                'active_connections': 0,
-                'idle_connections': 0
-            }
-        
-        return jsonify({
-            'performance_metrics': performance_metrics,
-            'performance_trends': performance_trends,
-            'database_size': db_size,
-            'table_counts': table_counts,
-            'connection_stats': connection_stats,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting system performance: {e}")
-        return jsonify({
-            'performance_metrics': {
-                'total_tasks': 0,
-                'avg_processing_time': 0,
-                'slow_tasks': 0
-            },
-            'performance_trends': [],
-            'database_size': 'Unknown',
-            'table_counts': {},
-            'connection_stats': {
-                'total_connections': 0,
-                'active_connections': 0,
-                'idle_connections': 0
-            },
-            'timestamp': datetime.now().isoformat(),
-            'error': 'Failed to fetch performance data'
-        }), 200  # Return 200 with error message instead of 500
-
-@admin_bp.route('/api/system/errors')
-@require_auth
-def api_system_errors():
-    """API endpoint for system error logs and statistics"""
-    try:
-        analytics = AdminAnalytics()
-        
-        # Get recent errors (last 24 hours)
-        recent_errors = analytics.db.execute_query("""
-            SELECT 
-                timestamp,
-                error_type,
-                error_message,
-                user_phone,
-                COUNT(*) OVER (PARTITION BY error_type) as error_count
-            FROM error_logs
-            WHERE timestamp >= NOW() - INTERVAL '24 hours'
-            ORDER BY timestamp DESC
-            LIMIT 50
-        """) or []
-        
-        # Get error statistics by type
-        error_stats = analytics.db.execute_query("""
-            SELECT 
-                error_type,
-                COUNT(*) as count,
-                MAX(timestamp) as last_occurrence,
-                MIN(timestamp) as first_occurrence
-            FROM error_logs
-            WHERE timestamp >= NOW() - INTERVAL '7 days'
-            GROUP BY error_type
-            ORDER BY count DESC
-        """) or []
-        
-        # Get error trends over time
-        error_trends = analytics.db.execute_query("""
-            SELECT 
-                DATE_TRUNC('hour', timestamp) as hour,
-                COUNT(*) as error_count,
-                COUNT(DISTINCT error_type) as unique_error_types
-            FROM error_logs
-            WHERE timestamp >= NOW() - INTERVAL '24 hours'
-            GROUP BY DATE_TRUNC('hour', timestamp)
-            ORDER BY hour
-        """) or []
-        
-        # Get top error-prone users
-        user_errors = analytics.db.execute_query("""
-            SELECT 
-                user_phone,
-                COUNT(*) as error_count,
-                COUNT(DISTINCT error_type) as unique_errors,
-                MAX(timestamp) as last_error
-            FROM error_logs
-            WHERE timestamp >= NOW() - INTERVAL '24 hours'
-            AND user_phone IS NOT NULL
-            GROUP BY user_phone
-            ORDER BY error_count DESC
-            LIMIT 10
-        """) or []
-        
-        # Calculate error rates
-        total_tasks_24h = analytics.db.execute_query("""
-            SELECT COUNT(*) as count
-            FROM tasks
-            WHERE created_at >= NOW() - INTERVAL '24 hours'
-        """, fetch='one') or {'count': 0}
-        
-        total_errors_24h = analytics.db.execute_query("""
-            SELECT COUNT(*) as count
-            FROM error_logs
-            WHERE timestamp >= NOW() - INTERVAL '24 hours'
-        """, fetch='one') or {'count': 0}
-        
-        error_rate = 0
-        if total_tasks_24h['count'] > 0:
-            error_rate = (total_errors_24h['count'] / total_tasks_24h['count']) * 100
-        
-        return jsonify({
+        return ojson({
             'recent_errors': recent_errors,
-            'error_stats': error_stats,
-            'error_trends': error_trends,
-            'user_errors': user_errors,
-            'summary': {
-                'total_errors_24h': total_errors_24h['count'],
-                'total_tasks_24h': total_tasks_24h['count'],
-                'error_rate_percentage': round(error_rate, 2),
-                'unique_error_types': len(error_stats)
-            },
-            'timestamp': datetime.now().isoformat()
+            'next_cursor': next_cursor,
+            **error_summary,
+            'timestamp': _iso_now()
         })
         
     except Exception as e:
         logger.error(f"Error getting system errors: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojson({'error': 'Internal server error'}), 500
 
 @admin_bp.route('/api/system/config')
 @require_auth
+@etagged
 def api_system_config():
     """API endpoint for system configuration"""
     try:
-        analytics = AdminAnalytics()
-        
-        # Database configuration with better error handling
-        try:
-            db_config = analytics.db.execute_query("""
-                SELECT 
-                    name,
-                    setting,
-                    COALESCE(unit, '') as unit,
-                    COALESCE(category, 'General') as category,
-                    COALESCE(short_desc, '') as short_desc
-                FROM pg_settings
-                WHERE name IN (
-                    'max_connections',
-                    'shared_buffers',
-                    'effective_cache_size',
-                    'maintenance_work_mem',
-                    'checkpoint_completion_target',
-                    'wal_buffers',
-                    'default_statistics_target',
-                    'random_page_cost',
-                    'effective_io_concurrency',
-                    'work_mem'
-                )
-                ORDER BY name
-            """)
-            
-            if not db_config:
-                db_config = []
-        except Exception as e:
-            logger.warning(f"Error getting database config: {e}")
-            db_config = []
+        # Database settings and connectivity come from the background refresher
+        status = get_system_status()
         
         # Application configuration - safer environment variable handling
         try:
-            app_config = {
-                'admin_username': os.environ.get('ADMIN_USERNAME', 'admin'),
-                'flask_env': os.environ.get('FLASK_ENV', 'production'),
-                'database_url': 'Configured' if os.environ.get('DATABASE_URL') else 'Not configured',
-                'redis_url': 'Configured' if os.environ.get('REDIS_URL') else 'Not configured',
-                'twilio_configured': bool(os.environ.get('TWILIO_ACCOUNT_SID')),
-                'openai_configured': bool(os.environ.get('OPENAI_API_KEY')),
-                'rate_limits': {
-                    'free': os.environ.get('RATE_LIMIT_FREE', '10'),
-                    'premium': os.environ.get('RATE_LIMIT_PREMIUM', '100'),
-                    'enterprise': os.environ.get('RATE_LIMIT_ENTERPRISE', '1000')
-                },
-                'features': {
-                    'backup_enabled': bool(os.environ.get('BACKUP_ENABLED', True)),
-                    'analytics_enabled': bool(os.environ.get('ANALYTICS_ENABLED', True)),
-                    'rate_limiting_enabled': bool(os.environ.get('RATE_LIMITING_ENABLED', True)),
-                    'error_tracking_enabled': bool(os.environ.get('ERROR_TRACKING_ENABLED', True))
-                }
-            }
+            app_config = get_app_config()
         except Exception as e:
             logger.warning(f"Error getting app config: {e}")
             app_config = {
@@ -770,51 +914,16 @@ def api_system_config():
                 }
             }
         
-        # System status
-        try:
-            system_status = {
-                'database_connected': True,
-                'redis_connected': True,  # Assume true if we got this far
-                'uptime': 'Unknown',
-                'version': '1.0.0',
-                'last_backup': 'Unknown',
-                'total_requests_today': 0
-            }
-            
-            # Try to get some basic system stats
-            try:
-                stats_result = analytics.db.execute_query("""
-                    SELECT COUNT(*) as total_requests
-                    FROM tasks
-                    WHERE created_at >= CURRENT_DATE
-                """, fetch='one')
-                
-                if stats_result:
-                    system_status['total_requests_today'] = stats_result.get('total_requests', 0)
-            except:
-                pass  # Keep default value
-                
-        except Exception as e:
-            logger.warning(f"Error getting system status: {e}")
-            system_status = {
-                'database_connected': False,
-                'redis_connected': False,
-                'uptime': 'Unknown',
-                'version': '1.0.0',
-                'last_backup': 'Unknown',
-                'total_requests_today': 0
-            }
-        
-        return jsonify({
-            'database_config': db_config,
+        # etagged adds the timestamp outside the ETag
+        return {
+            'database_config': status['database_config'],
             'application_config': app_config,
-            'system_status': system_status,
-            'timestamp': datetime.now().isoformat()
-        })
+            'system_status': status['system_status']
+        }
         
     except Exception as e:
         logger.error(f"Error getting system config: {e}")
-        return jsonify({
+        return ojson({
             'database_config': [],
             'application_config': {
                 'admin_username': 'admin',
@@ -839,7 +948,7 @@ def api_system_config():
                 'last_backup': 'Unknown',
                 'total_requests_today': 0
             },
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _iso_now(),
             'error': 'Failed to fetch system configuration'
         }), 200
 
@@ -848,17 +957,30 @@ def api_system_config():
 def api_insert_sample_data():
     """Insert sample data for testing"""
     try:
-        analytics = AdminAnalytics()
+        analytics = get_analytics()
         success = analytics.insert_sample_data()
         
         if success:
-            return jsonify({'success': True, 'message': 'Sample data inserted successfully'})
+            return ojson({'success': True, 'message': 'Sample data inserted successfully'})
         else:
-            return jsonify({'error': 'Failed to insert sample data'}), 500
+            return ojson({'error': 'Failed to insert sample data'}), 500
             
     except Exception as e:
         logger.error(f"Error inserting sample data: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojson({'error': 'Internal server error'}), 500
+
+_analytics = None
+_analytics_lock = threading.Lock()
+
+def get_analytics():
+    """Return the shared AdminAnalytics instance, creating it on first use"""
+    global _analytics
+    if _analytics is None:
+        # Concurrent panel loaders can race here on the first request
+        with _analytics_lock:
+            if _analytics is None:
+                _analytics = AdminAnalytics()
+    return _analytics
 
 class AdminAnalytics:
     """Enhanced analytics system for comprehensive system monitoring"""
@@ -866,56 +988,115 @@ class AdminAnalytics:
     def __init__(self):
         """Initialize analytics with PostgreSQL database manager"""
         self.db = get_database_manager()
+        # tdigest streams the median instead of sorting every task in the window
+        if self.db.has_extension('tdigest'):
+            self.median_processing_time_sql = "tdigest_percentile(processing_time::float8, 100, 0.5)"
+        else:
+            self.median_processing_time_sql = "PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY processing_time)"
+        # hll counts distinct users in fixed memory instead of hashing every phone number
+        if self.db.has_extension('hll'):
+            self.distinct_users_sql = "COALESCE(hll_cardinality(hll_add_agg(hll_hash_text(user_phone)) FILTER (WHERE {condition})), 0)::bigint"
+        else:
+            self.distinct_users_sql = "COUNT(DISTINCT user_phone) FILTER (WHERE {condition})"
         logger.info("Admin Analytics initialized with PostgreSQL")
+        start_rollup_refresher()
     
+    def _try_rollup_lock(self, cursor, lock_id):
+        """Take advisory lock `lock_id` for the cursor's transaction; False if another worker holds it"""
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s) AS locked", (lock_id,))
+        return cursor.fetchone()['locked']
+    
+    def refresh_daily_task_stats(self, days=2):
+        """Re-aggregate the last `days` days of tasks into daily_task_stats (all history when None)
+        
+        Returns False without touching the table when another worker is
+        already refreshing it.
+        """
+        cutoff_clause = "WHERE t.created_at >= %s" if days is not None else ""
+        delete_clause = "WHERE day >= %s" if days is not None else ""
+        since = _today() - timedelta(days=days or 0)
+        
+        with self.db.get_cursor() as cursor:
+            if not self._try_rollup_lock(cursor, DAILY_ROLLUP_LOCK_ID):
+                return False
+            cursor.execute(f"DELETE FROM daily_task_stats {delete_clause}",
+                           (since.date(),) if days is not None else ())
+            cursor.execute(f"""
+                INSERT INTO daily_task_stats (
+                    day, category, tier, total_tasks, successful_tasks,
+                    timed_tasks, sum_processing_time, scored_tasks, sum_complexity, updated_at
+                )
+                SELECT 
+                    DATE(t.created_at),
+                    COALESCE(t.category, ''),
+                    COALESCE(u.tier::text, ''),
+                    COUNT(*),
+                    COUNT(*) FILTER (WHERE t.success = true),
+                    COUNT(t.processing_time),
+                    COALESCE(SUM(t.processing_time), 0),
+                    COUNT(t.complexity_score),
+                    COALESCE(SUM(t.complexity_score), 0),
+                    NOW()
+                FROM tasks t
+                LEFT JOIN users u ON u.phone_number = t.user_phone
+                {cutoff_clause}
+                GROUP BY 1, 2, 3
+            """, (since,) if days is not None else ())
+        return True
+    
+    def refresh_hourly_rollups(self):
+        """Recompute the tasks_hourly and error_logs_hourly materialized views
+        
+        Returns False when another worker is already refreshing them.
+        """
+        with self.db.get_cursor() as cursor:
+            if not self._try_rollup_lock(cursor, HOURLY_ROLLUP_LOCK_ID):
+                return False
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY tasks_hourly")
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY error_logs_hourly")
+        return True
+    
+    @ttl_cache(60, tags=('users', 'tasks'), shared=True)
     def get_system_overview(self):
         """Get comprehensive system overview with key metrics"""
         try:
-            # Get total users by tier
-            users_by_tier = self.db.execute_query("""
-                SELECT tier, COUNT(*) as count 
-                FROM users 
-                GROUP BY tier
-            """) or []
-            
-            # Get total tasks and success rate
-            task_stats = self.db.execute_query("""
+            # Users by tier (already shaped as {tier: count}) and all-time task
+            # totals in one row
+            row = self.db.execute_query("""
+                WITH task_stats AS (
+                    SELECT 
+                        COUNT(*) as total_tasks,
+                        COALESCE(ROUND(COUNT(*) FILTER (WHERE success) * 100.0 / NULLIF(COUNT(*), 0), 2), 0)::float8 as success_rate,
+                        COALESCE(ROUND(AVG(processing_time)::numeric, 2), 0)::float8 as avg_processing_time,
+                        COALESCE(ROUND(AVG(tokens_used)::numeric, 2), 0)::float8 as avg_tokens_used
+                    FROM tasks
+                ),
+                users_by_tier AS (
+                    SELECT tier, COUNT(*) as count 
+                    FROM users 
+                    GROUP BY tier
+                )
                 SELECT 
-                    COUNT(*) as total_tasks,
-                    COUNT(CASE WHEN success = true THEN 1 END) as successful_tasks,
-                    AVG(processing_time) as avg_processing_time,
-                    AVG(tokens_used) as avg_tokens_used
-                FROM tasks
-            """, fetch='one') or {}
+                    task_stats.*,
+                    (SELECT COALESCE(SUM(count), 0)::bigint FROM users_by_tier) as total_users,
+                    (SELECT COALESCE(jsonb_object_agg(tier, count) FILTER (WHERE tier IS NOT NULL), '{}'::jsonb)
+                     FROM users_by_tier) as users_by_tier
+                FROM task_stats
+            """, fetch='one', prepared=True) or {}
             
-            # Get recent activity (last 24 hours)
-            recent_activity = self.db.execute_query("""
-                SELECT COUNT(*) as count
-                FROM tasks 
-                WHERE created_at >= NOW() - INTERVAL '24 hours'
-            """, fetch='one') or {'count': 0}
-            
-            # Get active users (last 7 days)
-            active_users = self.db.execute_query("""
-                SELECT COUNT(DISTINCT user_phone) as count
-                FROM tasks 
-                WHERE created_at >= NOW() - INTERVAL '7 days'
-            """, fetch='one') or {'count': 0}
-            
-            # Calculate success rate
-            success_rate = 0
-            if task_stats.get('total_tasks', 0) > 0:
-                success_rate = (task_stats.get('successful_tasks', 0) / task_stats.get('total_tasks', 1)) * 100
+            # 24h activity and 7-day active users come from the shared snapshot
+            activity = self.get_health_snapshot()
             
+            # Rates and averages arrive already rounded from PostgreSQL
             return {
-                'total_users': sum(tier['count'] for tier in users_by_tier),
-                'users_by_tier': {tier['tier']: tier['count'] for tier in users_by_tier},
-                'total_tasks': task_stats.get('total_tasks', 0),
-                'success_rate': round(success_rate, 2),
-                'avg_processing_time': round(task_stats.get('avg_processing_time', 0) or 0, 2),
-                'avg_tokens_used': round(task_stats.get('avg_tokens_used', 0) or 0, 2),
-                'recent_activity': recent_activity['count'],
-                'active_users': active_users['count']
+                'total_users': row.get('total_users', 0),
+                'users_by_tier': row.get('users_by_tier', {}),
+                'total_tasks': row.get('total_tasks', 0),
+                'success_rate': row.get('success_rate', 0),
+                'avg_processing_time': row.get('avg_processing_time', 0),
+                'avg_tokens_used': row.get('avg_tokens_used', 0),
+                'recent_activity': activity['24h']['tasks'],
+                'active_users': activity['7d']['active_users']
             }
             
         except Exception as e:
@@ -926,19 +1107,22 @@ class AdminAnalytics:
                 'recent_activity': 0, 'active_users': 0
             }
     
+    @ttl_cache(300, tags=('users', 'tasks'), shared=True)
     def get_user_analytics(self, days=30):
         """Get user activity analytics for specified period"""
         try:
+            since = _cutoff(days=days)
+            
             # User registration trends
             user_trends = self.db.execute_query("""
                 SELECT 
                     DATE(created_at) as date,
                     COUNT(*) as new_users
                 FROM users 
-                WHERE created_at >= NOW() - INTERVAL '%s days'
+                WHERE created_at >= %s
                 GROUP BY DATE(created_at)
                 ORDER BY date
-            """, (days,))
+            """, (since,))
             
             # User activity by tier
             tier_activity = self.db.execute_query("""
@@ -948,9 +1132,9 @@ class AdminAnalytics:
                     COUNT(DISTINCT u.phone_number) as active_users
                 FROM users u
                 LEFT JOIN tasks t ON u.phone_number = t.user_phone 
-                    AND t.created_at >= NOW() - INTERVAL '%s days'
+                    AND t.created_at >= %s
                 GROUP BY u.tier
-            """, (days,))
+            """, (since,))
             
             # Top users by activity
             top_users = self.db.execute_query("""
@@ -962,11 +1146,11 @@ class AdminAnalytics:
                     MAX(t.created_at) as last_activity
                 FROM users u
                 JOIN tasks t ON u.phone_number = t.user_phone
-                WHERE t.created_at >= NOW() - INTERVAL '%s days'
+                WHERE t.created_at >= %s
                 GROUP BY u.phone_number, u.tier
                 ORDER BY task_count DESC
                 LIMIT 20
-            """, (days,))
+            """, (since,))
             
             return {
                 'user_trends': user_trends or [],
@@ -978,47 +1162,81 @@ class AdminAnalytics:
             logger.error(f"Error getting user analytics: {e}")
             return {'user_trends': [], 'tier_activity': [], 'top_users': []}
     
+    @ttl_cache(300, tags=('tasks',), shared=True)
     def get_task_analytics(self, days=30):
         """Get comprehensive task analytics"""
         try:
-            # Task trends over time
+            today = _today()
+            first_day = (today - timedelta(days=days)).date()
+            
+            # Completed days come from the daily_task_stats rollup; only
+            # today's partial bucket is aggregated from raw tasks
             task_trends = self.db.execute_query("""
+                SELECT 
+                    day as date,
+                    SUM(total_tasks) as total_tasks,
+                    SUM(successful_tasks) as successful_tasks,
+                    SUM(sum_processing_time) / NULLIF(SUM(timed_tasks), 0) as avg_time
+                FROM daily_task_stats
+                WHERE day >= %s AND day < %s
+                GROUP BY day
+                UNION ALL
                 SELECT 
                     DATE(created_at) as date,
                     COUNT(*) as total_tasks,
-                    COUNT(CASE WHEN success = true THEN 1 END) as successful_tasks,
+                    COUNT(*) FILTER (WHERE success = true) as successful_tasks,
                     AVG(processing_time) as avg_time
                 FROM tasks
-                WHERE created_at >= NOW() - INTERVAL '%s days'
+                WHERE created_at >= %s
                 GROUP BY DATE(created_at)
                 ORDER BY date
-            """, (days,))
+            """, (first_day, today.date(), today), prepared=True)
             
             # Task categories
             category_stats = self.db.execute_query("""
                 SELECT 
                     category,
-                    COUNT(*) as count,
-                    AVG(processing_time) as avg_time,
-                    AVG(complexity_score) as avg_complexity
-                FROM tasks
-                WHERE created_at >= NOW() - INTERVAL '%s days'
+                    SUM(task_count) as count,
+                    SUM(sum_processing_time) / NULLIF(SUM(timed_tasks), 0) as avg_time,
+                    SUM(sum_complexity) / NULLIF(SUM(scored_tasks), 0) as avg_complexity
+                FROM (
+                    SELECT 
+                        NULLIF(category, '') as category,
+                        total_tasks as task_count,
+                        timed_tasks,
+                        sum_processing_time,
+                        scored_tasks,
+                        sum_complexity
+                    FROM daily_task_stats
+                    WHERE day >= %s AND day < %s
+                    UNION ALL
+                    SELECT 
+                        category,
+                        COUNT(*),
+                        COUNT(processing_time),
+                        SUM(processing_time),
+                        COUNT(complexity_score),
+                        SUM(complexity_score)
+                    FROM tasks
+                    WHERE created_at >= %s
+                    GROUP BY category
+                ) daily
                 GROUP BY category
                 ORDER BY count DESC
-            """, (days,))
+            """, (first_day, today.date(), today), prepared=True)
             
             # Performance metrics
-            performance = self.db.execute_query("""
+            performance = self.db.execute_query(f"""
                 SELECT 
-                    AVG(processing_time) as avg_processing_time,
+                    ROUND(AVG(processing_time)::numeric, 2)::float8 as avg_processing_time,
                     MIN(processing_time) as min_processing_time,
                     MAX(processing_time) as max_processing_time,
-                    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY processing_time) as median_processing_time,
-                    AVG(tokens_used) as avg_tokens,
-                    COUNT(CASE WHEN success = false THEN 1 END) as error_count
+                    {self.median_processing_time_sql} as median_processing_time,
+                    ROUND(AVG(tokens_used)::numeric, 2)::float8 as avg_tokens,
+                    COUNT(*) FILTER (WHERE success = false) as error_count
                 FROM tasks
-                WHERE created_at >= NOW() - INTERVAL '%s days'
-            """, (days,), fetch='one') or {}
+                WHERE created_at >= %s
+            """, (_cutoff(days=days),), fetch='one') or {}
             
             return {
                 'task_trends': task_trends or [],
@@ -1030,11 +1248,13 @@ class AdminAnalytics:
             logger.error(f"Error getting task analytics: {e}")
             return {'task_trends': [], 'category_stats': [], 'performance': {}}
     
+    @ttl_cache(10, tags=('tasks',), shared=True)
     def get_system_health(self):
         """Get comprehensive system health metrics"""
         try:
             # Database health
             db_health = self.db.health_check()
+            since = _cutoff(hours=24)
             
             # Error rate analysis
             error_stats = self.db.execute_query("""
@@ -1043,33 +1263,23 @@ class AdminAnalytics:
                     COUNT(*) as count,
                     MAX(timestamp) as last_occurrence
                 FROM error_logs
-                WHERE timestamp >= NOW() - INTERVAL '24 hours'
+                WHERE timestamp >= %s
                 GROUP BY error_type
                 ORDER BY count DESC
-            """)
+            """, (since,), prepared=True)
             
             # Performance alerts
-            slow_tasks = self.db.execute_query("""
-                SELECT COUNT(*) as count
-                FROM tasks
-                WHERE processing_time > 30 
-                AND created_at >= NOW() - INTERVAL '24 hours'
-            """, fetch='one') or {'count': 0}
+            activity = self.get_health_snapshot()
             
             # Recent errors
-            recent_errors = self.db.execute_query("""
-                SELECT timestamp, error_type, error_message, user_phone
-                FROM error_logs
-                WHERE timestamp >= NOW() - INTERVAL '1 hour'
-                ORDER BY timestamp DESC
-                LIMIT 10
-            """)
+            recent_errors = self.get_recent_errors(hours=1, limit=10)
             
             return {
                 'database_health': db_health,
                 'error_stats': error_stats or [],
-                'slow_tasks_count': slow_tasks['count'],
-                'recent_errors': recent_errors or []
+                'slow_tasks_count': activity['24h']['slow_tasks'],
+                'task_activity': activity,
+                'recent_errors': recent_errors
             }
             
         except Exception as e:
@@ -1081,16 +1291,498 @@ class AdminAnalytics:
                 'recent_errors': []
             }
     
-    def get_users_list(self, page=1, per_page=50, search=None, tier_filter=None):
-        """Get paginated users list with search and filtering"""
+    @ttl_cache(60, tags=('tasks',))
+    def get_detailed_analytics(self, range_start, range_end, start_date, end_date):
+        """Get daily, category, tier and performance analytics for [range_start, range_end) as JSON text"""
+        result = self.db.execute_query("""
+            WITH task_analytics AS (
+                SELECT 
+                    DATE(created_at) as date,
+                    COUNT(*) as total_tasks,
+                    COUNT(*) FILTER (WHERE success = true) as successful_tasks,
+                    COUNT(*) FILTER (WHERE success = false) as failed_tasks,
+                    ROUND(AVG(processing_time)::numeric, 2)::float8 as avg_processing_time,
+                    ROUND(AVG(tokens_used)::numeric, 2)::float8 as avg_tokens_used,
+                    ROUND(AVG(complexity_score)::numeric, 2)::float8 as avg_complexity
+                FROM tasks
+                WHERE created_at >= %(start)s AND created_at < %(end)s
+                GROUP BY DATE(created_at)
+            ),
+            category_analytics AS (
+                SELECT 
+                    category,
+                    COUNT(*) as task_count,
+                    ROUND(AVG(processing_time)::numeric, 2)::float8 as avg_processing_time,
+                    ROUND(AVG(complexity_score)::numeric, 2)::float8 as avg_complexity,
+                    COUNT(*) FILTER (WHERE success = true) as successful_tasks,
+                    COUNT(*) FILTER (WHERE success = false) as failed_tasks
+                FROM tasks
+                WHERE created_at >= %(start)s AND created_at < %(end)s
+                GROUP BY category
+            ),
+            user_activity AS (
+                SELECT 
+                    u.tier,
+                    COUNT(DISTINCT u.phone_number) as active_users,
+                    COUNT(t.id) as total_tasks,
+                    ROUND(AVG(t.processing_time)::numeric, 2)::float8 as avg_processing_time
+                FROM users u
+                JOIN tasks t ON u.phone_number = t.user_phone
+                WHERE t.created_at >= %(start)s AND t.created_at < %(end)s
+                GROUP BY u.tier
+            ),
+            performance_metrics AS (
+                SELECT 
+                    COUNT(*) as total_tasks,
+                    ROUND(AVG(processing_time)::numeric, 2)::float8 as avg_processing_time,
+                    MIN(processing_time) as min_processing_time,
+                    MAX(processing_time) as max_processing_time,
+                    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY processing_time) as median_processing_time,
+                    PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY processing_time) as p95_processing_time,
+                    ROUND(AVG(tokens_used)::numeric, 2)::float8 as avg_tokens_used,
+                    COUNT(*) FILTER (WHERE processing_time > 10) as slow_tasks
+                FROM tasks
+                WHERE created_at >= %(start)s AND created_at < %(end)s
+            )
+            SELECT json_build_object(
+                'date_range', json_build_object('start_date', %(start_date)s::text, 'end_date', %(end_date)s::text),
+                'task_analytics', (SELECT COALESCE(json_agg(task_analytics ORDER BY date), '[]'::json) FROM task_analytics),
+                'category_analytics', (SELECT COALESCE(json_agg(category_analytics ORDER BY task_count DESC), '[]'::json) FROM category_analytics),
+                'user_activity', (SELECT COALESCE(json_agg(user_activity), '[]'::json) FROM user_activity),
+                'performance_metrics', (SELECT row_to_json(performance_metrics) FROM performance_metrics)
+            )::text as payload
+        """, {'start': range_start, 'end': range_end, 'start_date': start_date, 'end_date': end_date}, fetch='one', prepared=True)
+        
+        # Cast to text so psycopg2 hands back the document without decoding it
+        return result['payload']
+    
+    @ttl_cache(60, tags=('users', 'tasks'))
+    def get_user_stats(self):
+        """Get user counts, growth, tier activity and recent registrations"""
+        day_ago, week_ago, month_ago = _cutoff(hours=24), _cutoff(days=7), _cutoff(days=30)
+        
+        # All four panels in one round trip, with the JSON built server-side
         try:
-            offset = (page - 1) * per_page
+            result = self.db.execute_query("""
+                WITH user_stats AS (
+                    SELECT 
+                        COUNT(*) as total_users,
+                        COUNT(*) FILTER (WHERE tier = 'free') as free_users,
+                        COUNT(*) FILTER (WHERE tier = 'premium') as premium_users,
+                        COUNT(*) FILTER (WHERE tier = 'enterprise') as enterprise_users,
+                        COUNT(*) FILTER (WHERE created_at >= %(week_ago)s) as new_users_week,
+                        COUNT(*) FILTER (WHERE created_at >= %(month_ago)s) as new_users_month,
+                        COUNT(*) FILTER (WHERE last_active >= %(day_ago)s) as active_24h,
+                        COUNT(*) FILTER (WHERE last_active >= %(week_ago)s) as active_7d,
+                        COUNT(*) FILTER (WHERE last_active >= %(month_ago)s) as active_30d
+                    FROM users
+                ),
+                growth_data AS (
+                    SELECT 
+                        DATE(created_at) as date,
+                        COUNT(*) as new_users
+                    FROM users
+                    WHERE created_at >= %(month_ago)s
+                    GROUP BY DATE(created_at)
+                ),
+                tier_activity AS (
+                    SELECT 
+                        u.tier,
+                        COUNT(DISTINCT u.phone_number) as user_count,
+                        COALESCE(COUNT(t.id), 0) as total_tasks,
+                        COALESCE(AVG(t.processing_time), 0) as avg_processing_time,
+                        COUNT(*) FILTER (WHERE t.success = true) as successful_tasks
+                    FROM users u
+                    LEFT JOIN tasks t ON u.phone_number = t.user_phone 
+                        AND t.created_at >= %(month_ago)s
+                    GROUP BY u.tier
+                ),
+                recent_users AS (
+                    SELECT 
+                        phone_number,
+                        tier,
+                        created_at,
+                        last_active
+                    FROM users
+                    ORDER BY created_at DESC
+                    LIMIT 10
+                )
+                SELECT json_build_object(
+                    'user_stats', (SELECT row_to_json(user_stats) FROM user_stats),
+                    'growth_data', (SELECT COALESCE(json_agg(growth_data ORDER BY date), '[]'::json) FROM growth_data),
+                    'tier_activity', (SELECT COALESCE(json_agg(tier_activity ORDER BY user_count DESC), '[]'::json) FROM tier_activity),
+                    'recent_users', (SELECT COALESCE(json_agg(recent_users ORDER BY created_at DESC), '[]'::json) FROM recent_users)
+                ) as payload
+            """, {'day_ago': day_ago, 'week_ago': week_ago, 'month_ago': month_ago}, fetch='one', prepared=True)
+            
+            # psycopg2 decodes the json column, so the payload is already a dict
+            return result['payload']
+            
+        except Exception as e:
+            logger.warning(f"Error getting user stats: {e}")
+            return {
+                'user_stats': {
+                    'total_users': 0,
+                    'free_users': 0,
+                    'premium_users': 0,
+                    'enterprise_users': 0,
+                    'new_users_week': 0,
+                    'new_users_month': 0,
+                    'active_24h': 0,
+                    'active_7d': 0,
+                    'active_30d': 0
+                },
+                'growth_data': [],
+                'tier_activity': [],
+                'recent_users': []
+            }
+    
+    @ttl_cache(30, tags=('tasks',))
+    def get_performance_metrics(self, deep=False):
+        """Get 24h task performance, hourly trends and database size/connection stats"""
+        day_ago = _cutoff(hours=24)
+        
+        # Get basic performance metrics - handle empty results
+        try:
+            performance_metrics = self.db.execute_query("""
+                SELECT 
+                    COUNT(*) as total_tasks,
+                    COALESCE(AVG(processing_time), 0) as avg_processing_time,
+                    COUNT(*) FILTER (WHERE processing_time > 10) as slow_tasks
+                FROM tasks
+                WHERE created_at >= %s
+            """, (day_ago,), fetch='one', prepared=True)
+            
+            if not performance_metrics:
+                performance_metrics = {
+                    'total_tasks': 0,
+                    'avg_processing_time': 0,
+                    'slow_tasks': 0
+                }
+        except Exception as e:
+            logger.warning(f"Error getting performance metrics: {e}")
+            performance_metrics = {
+                'total_tasks': 0,
+                'avg_processing_time': 0,
+                'slow_tasks': 0
+            }
+        
+        # Get recent performance trends - handle empty results
+        try:
+            performance_trends = self.db.execute_query("""
+                SELECT 
+                    s.hour,
+                    COALESCE(h.task_count, 0) as task_count,
+                    COALESCE(h.avg_processing_time, 0) as avg_processing_time
+                FROM generate_series(%s::timestamp, %s::timestamp, INTERVAL '1 hour') as s(hour)
+                LEFT JOIN tasks_hourly h ON h.hour = s.hour
+                ORDER BY s.hour
+            """, _hour_series(day_ago), prepared=True)
+            
+            if not performance_trends:
+                performance_trends = []
+        except Exception as e:
+            logger.warning(f"Error getting performance trends: {e}")
+            performance_trends = []
+        
+        # Get database size safely
+        try:
+            db_size_result = self.db.execute_query("""
+                SELECT pg_size_pretty(pg_database_size(current_database())) as size
+            """, fetch='one')
+            db_size = db_size_result.get('size', 'Unknown') if db_size_result else 'Unknown'
+        except Exception as e:
+            logger.warning(f"Error getting database size: {e}")
+            db_size = 'Unknown'
+        
+        # Get table counts safely
+        table_counts = {}
+        try:
+            table_data = self.db.iter_query("""
+                SELECT 
+                    schemaname,
+                    relname as table_name,
+                    COALESCE(n_live_tup, 0) as row_count
+                FROM pg_stat_user_tables
+                WHERE schemaname = 'public'
+                ORDER BY relname
+            """)
+            
+            table_counts = dict(map(itemgetter('table_name', 'row_count'), table_data))
+        except Exception as e:
+            logger.warning(f"Error getting table counts: {e}")
+            table_counts = {}
+        
+        # Get connection stats safely
+        try:
+            if not deep:
+                connection_stats = self.db.pool_stats()
+            else:
+                connection_stats = self.db.execute_query("""
+                    SELECT 
+                        COUNT(*) as total_connections,
+                        COUNT(*) FILTER (WHERE state = 'active') as active_connections,
+                        COUNT(*) FILTER (WHERE state = 'idle') as idle_connections
+                    FROM pg_stat_activity
+                    WHERE datname = current_database()
+                """, fetch='one')
+            
+            if not connection_stats:
+                connection_stats = {
+                    'total_connections': 0,
+                    'active_connections': 0,
+                    'idle_connections': 0
+                }
+        except Exception as e:
+            logger.warning(f"Error getting connection stats: {e}")
+            connection_stats = {
+                'total_connections': 0,
+                'active_connections': 0,
+                'idle_connections': 0
+            }
+        
+        return {
+            'performance_metrics': performance_metrics,
+            'performance_trends': performance_trends,
+            'database_size': db_size,
+            'table_counts': table_counts,
+            'connection_stats': connection_stats
+        }
+    
+    @ttl_cache(60, tags=('tasks',))
+    def get_error_summary(self):
+        """Get error statistics, hourly trends, error-prone users and the 24h error rate"""
+        day_ago, week_ago = _cutoff(hours=24), _cutoff(days=7)
+        
+        # Get error statistics by type
+        error_stats = self.db.execute_query("""
+            SELECT 
+                error_type,
+                COUNT(*) as count,
+                MAX(timestamp) as last_occurrence,
+                MIN(timestamp) as first_occurrence
+            FROM error_logs
+            WHERE timestamp >= %s
+            GROUP BY error_type
+            ORDER BY count DESC
+        """, (week_ago,), prepared=True) or []
+        
+        # Get error trends over time
+        error_trends = self.db.execute_query("""
+            SELECT 
+                s.hour,
+                COALESCE(h.error_count, 0) as error_count,
+                COALESCE(h.unique_error_types, 0) as unique_error_types
+            FROM generate_series(%s::timestamp, %s::timestamp, INTERVAL '1 hour') as s(hour)
+            LEFT JOIN error_logs_hourly h ON h.hour = s.hour
+            ORDER BY s.hour
+        """, _hour_series(day_ago), prepared=True) or []
+        
+        # Get top error-prone users
+        user_errors = self.db.execute_query("""
+            SELECT 
+                user_phone,
+                COUNT(*) as error_count,
+                COUNT(DISTINCT error_type) as unique_errors,
+                MAX(timestamp) as last_error
+            FROM error_logs
+            WHERE timestamp >= %s
+            AND user_phone IS NOT NULL
+            GROUP BY user_phone
+            ORDER BY error_count DESC
+            LIMIT 10
+        """, (day_ago,), prepared=True) or []
+        
+        # Calculate error rates
+        total_tasks_24h = self.get_health_snapshot()['24h']['tasks']
+        
+        row = self.db.execute_query("""
+            SELECT COUNT(*) as count
+            FROM error_logs
+            WHERE timestamp >= %s
+        """, (day_ago,), fetch='one', prepared=True)
+        total_errors_24h = row['count'] if row else 0
+        
+        error_rate = total_errors_24h * 100 / total_tasks_24h if total_tasks_24h else 0
+        
+        return {
+            'error_stats': error_stats,
+            'error_trends': error_trends,
+            'user_errors': user_errors,
+            'summary': {
+                'total_errors_24h': total_errors_24h,
+                'total_tasks_24h': total_tasks_24h,
+                'error_rate_percentage': round(error_rate, 2),
+                'unique_error_types': len(error_stats)
+            }
+        }
+    
+    @ttl_cache(10, tags=('tasks',))
+    def get_health_snapshot(self):
+        """Get task volume, success rate, active users and slow tasks for every HEALTH_BUCKETS window.
+        
+        One range scan over the widest window feeds the overview, the health
+        check and the error-rate summary.
+        """
+        cutoffs = {name: _cutoff(**delta) for name, delta in HEALTH_BUCKETS}
+        columns = ",\n".join(f"""
+                COUNT(*) FILTER (WHERE created_at >= %({name})s) as tasks_{name},
+                COUNT(*) FILTER (WHERE created_at >= %({name})s AND success = true) as successful_{name},
+                {self.distinct_users_sql.format(condition=f"created_at >= %({name})s")} as users_{name},
+                COUNT(*) FILTER (WHERE created_at >= %({name})s AND processing_time > %(slow)s) as slow_{name}"""
+            for name, _ in HEALTH_BUCKETS)
+        
+        row = self.db.execute_query(f"""
+            SELECT {columns}
+            FROM tasks
+            WHERE created_at >= %(oldest)s
+        """, {**cutoffs, 'oldest': min(cutoffs.values()), 'slow': SLOW_TASK_SECONDS}, fetch='one', prepared=True) or {}
+        
+        snapshot = {}
+        for name, _ in HEALTH_BUCKETS:
+            tasks = row.get(f'tasks_{name}', 0)
+            successful = row.get(f'successful_{name}', 0)
+            snapshot[name] = {
+                'tasks': tasks,
+                'successful_tasks': successful,
+                'success_rate': round(successful * 100 / tasks, 2) if tasks else 0,
+                'active_users': row.get(f'users_{name}', 0),
+                'slow_tasks': row.get(f'slow_{name}', 0)
+            }
+        return snapshot
+    
+    def get_recent_errors(self, hours=24, limit=50, before=None):
+        """Get the newest error logs with message and request text trimmed in SQL.
+        
+        Pass the last row's ``(timestamp, id)`` as `before` to fetch the next
+        page; the id breaks ties between errors logged in the same instant.
+        """
+        params = {'since': _cutoff(hours=hours), 'limit': limit, 'chars': ERROR_PREVIEW_CHARS}
+        cursor_clause = ""
+        if before:
+            params['before_ts'], params['before_id'] = before
+            cursor_clause = "AND (timestamp, id) < (%(before_ts)s, %(before_id)s)"
+        
+        return self.db.execute_query(f"""
+            SELECT 
+                id,
+                timestamp,
+                error_type,
+                LEFT(error_message, %(chars)s) ||
+                    CASE WHEN LENGTH(error_message) > %(chars)s THEN '...' ELSE '' END as error_message,
+                user_phone,
+                task_id,
+                LEFT(request_text, %(chars)s) ||
+                    CASE WHEN LENGTH(request_text) > %(chars)s THEN '...' ELSE '' END as request_preview
+            FROM error_logs
+            WHERE timestamp >= %(since)s
+            {cursor_clause}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT %(limit)s
+        """, params, prepared=True) or []
+    
+    def update_user_tier(self, phone_number, tier):
+        """Update a single user's tier"""
+        return self.update_user_tiers([(phone_number, tier)])
+    
+    def update_user_tiers(self, updates):
+        """Update tiers for a list of (phone_number, tier) pairs in one transaction"""
+        updated = self.db.execute_many("""
+            UPDATE users 
+            SET tier = %s 
+            WHERE phone_number = %s
+        """, [(tier, phone_number) for phone_number, tier in updates])
+        invalidate_cache('users')
+        return updated
+    
+    def get_system_status(self):
+        """Database settings plus database/Redis connectivity for the system config page"""
+        try:
+            db_config = self.db.execute_query("""
+                SELECT 
+                    name,
+                    setting,
+                    COALESCE(unit, '') as unit,
+                    COALESCE(category, 'General') as category,
+                    COALESCE(short_desc, '') as short_desc
+                FROM pg_settings
+                WHERE name IN (
+                    'max_connections',
+                    'shared_buffers',
+                    'effective_cache_size',
+                    'maintenance_work_mem',
+                    'checkpoint_completion_target',
+                    'wal_buffers',
+                    'default_statistics_target',
+                    'random_page_cost',
+                    'effective_io_concurrency',
+                    'work_mem'
+                )
+                ORDER BY name
+            """) or []
+            database_connected = True
+        except Exception as e:
+            logger.warning(f"Error getting database config: {e}")
+            db_config = []
+            database_connected = False
+        
+        system_status = {
+            'database_connected': database_connected,
+            'redis_connected': False,
+            'uptime': 'Unknown',
+            'version': '1.0.0',
+            'last_backup': 'Unknown',
+            'total_requests_today': 0
+        }
+        
+        if database_connected:
+            try:
+                stats_result = self.db.execute_query("""
+                    SELECT COUNT(*) as total_requests
+                    FROM tasks
+                    WHERE created_at >= %s
+                """, (_today(),), fetch='one')
+                
+                if stats_result:
+                    system_status['total_requests_today'] = stats_result.get('total_requests', 0)
+            except Exception as e:
+                logger.warning(f"Error getting today's request count: {e}")
+        
+        try:
+            redis_client = get_redis()
+            system_status['redis_connected'] = bool(redis_client and redis_client.ping())
+        except Exception as e:
+            logger.warning(f"Redis ping failed: {e}")
+        
+        return {'database_config': db_config, 'system_status': system_status}
+    
+    @ttl_cache(60, tags=('users',))
+    def count_users(self):
+        """Get the total number of users (cached for unfiltered pagination)"""
+        result = self.db.execute_query("SELECT COUNT(*) as total FROM users", fetch='one')
+        return result['total'] if result else 0
+    
+    def get_users_list(self, page=1, per_page=50, search=None, tier_filter=None, cursor=None):
+        """Get paginated users list with search and filtering.
+
+        Passing ``cursor`` (the ``next_cursor`` of the previous page) seeks
+        past that row on the sort_key index instead of using OFFSET, so deep
+        pages cost the same as the first one.
+        """
+        try:
+            offset = 0 if cursor else (page - 1) * per_page
             
             # Build WHERE clause
             where_conditions = []
             params = []
             
-            if search:
+            if search and len(search.split()) > 1:
+                # Several words: match them all, in any field and order, with one
+                # probe of the search_tsv GIN index
+                where_conditions.append("search_tsv @@ plainto_tsquery('simple', %s)")
+                params.append(search)
+            elif search:
+                # A single term keeps substring semantics via the trigram indexes
                 where_conditions.append("(phone_number ILIKE %s OR COALESCE(email, '') ILIKE %s OR COALESCE(full_name, '') ILIKE %s)")
                 search_param = f"%{search}%"
                 params.extend([search_param, search_param, search_param])
@@ -1101,24 +1793,38 @@ class AdminAnalytics:
             
             where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
             
-            # Get users with simplified query to avoid PostgreSQL issues
+            # A filtered total comes back with the page as a window count so the
+            # ILIKE predicate is evaluated once; the cursor is applied outside it
+            # to keep the total covering every matching row
+            total_column = ",\n                        COUNT(*) OVER() as _total" if where_conditions else ""
+            cursor_clause = ""
+            if cursor:
+                # "<sort_key ISO timestamp>|<phone_number>" of the last row already shown
+                after_sort_key, _, after_phone = cursor.partition('|')
+                cursor_clause = "WHERE (sort_key, phone_number) < (%s::timestamp, %s)"
+                params.extend([after_sort_key, after_phone])
+            
             try:
                 users_query = f"""
-                    SELECT 
-                        phone_number,
-                        tier,
-                        created_at,
-                        last_active,
-                        COALESCE(total_requests, 0) as total_requests,
-                        COALESCE(monthly_requests, 0) as monthly_requests,
-                        rate_limit_reset,
-                        email,
-                        full_name,
-                        timezone,
-                        preferences
-                    FROM users
-                    {where_clause}
-                    ORDER BY COALESCE(last_active, created_at) DESC
+                    SELECT * FROM (
+                        SELECT 
+                            phone_number,
+                            tier,
+                            created_at,
+                            last_active,
+                            COALESCE(total_requests, 0) as total_requests,
+                            COALESCE(monthly_requests, 0) as monthly_requests,
+                            rate_limit_reset,
+                            email,
+                            full_name,
+                            timezone,
+                            preferences,
+                            sort_key{total_column}
+                        FROM users
+                        {where_clause}
+                    ) u
+                    {cursor_clause}
+                    ORDER BY sort_key DESC, phone_number DESC
                     LIMIT %s OFFSET %s
                 """
                 
@@ -1126,51 +1832,47 @@ class AdminAnalytics:
                 users_result = self.db.execute_query(users_query, tuple(params))
                 users = users_result if users_result else []
                 
-                # Add task counts separately to avoid complex JOINs
-                for user in users:
-                    try:
-                        task_count_result = self.db.execute_query("""
-                            SELECT 
-                                COUNT(*) as task_count,
-                                MAX(created_at) as last_task
-                            FROM tasks 
-                            WHERE user_phone = %s
-                        """, (user['phone_number'],), fetch='one')
-                        
-                        if task_count_result:
-                            user['task_count'] = task_count_result.get('task_count', 0)
-                            user['last_task'] = task_count_result.get('last_task')
-                        else:
-                            user['task_count'] = 0
-                            user['last_task'] = None
-                    except:
-                        user['task_count'] = 0
-                        user['last_task'] = None
-                        
+                # Task counts for the whole page in one grouped pass over tasks
+                if users:
+                    stats_rows = self.db.execute_query("""
+                        SELECT user_phone, COUNT(*) as task_count, MAX(created_at) as last_task
+                        FROM tasks
+                        WHERE user_phone = ANY(%s)
+                        GROUP BY user_phone
+                    """, ([u['phone_number'] for u in users],), prepared=True)
+                    get_stats = itemgetter('task_count', 'last_task')
+                    task_stats = {row['user_phone']: get_stats(row) for row in stats_rows}
+                    no_tasks = (0, None)
+                    for user in users:
+                        user['task_count'], user['last_task'] = task_stats.get(user['phone_number'], no_tasks)
+                
             except Exception as e:
                 logger.warning(f"Error getting users: {e}")
                 users = []
             
-            # Get total count with simpler query
-            try:
-                count_query = f"""
-                    SELECT COUNT(*) as total
-                    FROM users
-                    {where_clause}
-                """
-                count_params = params[:-2] if where_conditions else []
-                total_result = self.db.execute_query(count_query, tuple(count_params), fetch='one')
-                total_users = total_result.get('total', 0) if total_result else 0
-            except Exception as e:
-                logger.warning(f"Error getting user count: {e}")
-                total_users = len(users)  # Fallback to current page count
+            if where_conditions:
+                total_users = users[0]['_total'] if users else 0
+                for user in users:
+                    del user['_total']
+            else:
+                try:
+                    total_users = self.count_users()
+                except Exception as e:
+                    logger.warning(f"Error getting user count: {e}")
+                    total_users = len(users)  # Fallback to current page count
+            
+            next_cursor = None
+            if len(users) == per_page and users[-1]['sort_key'] is not None:
+                last = users[-1]
+                next_cursor = f"{last['sort_key'].isoformat()}|{last['phone_number']}"
             
             return {
                 'users': users,
                 'total': total_users,
                 'page': page,
                 'per_page': per_page,
-                'total_pages': max(1, (total_users + per_page - 1) // per_page)
+                'total_pages': max(1, (total_users + per_page - 1) // per_page),
+                'next_cursor': next_cursor
             }
             
         except Exception as e:
@@ -1180,7 +1882,8 @@ class AdminAnalytics:
                 'total': 0, 
                 'page': 1, 
                 'per_page': per_page, 
-                'total_pages': 0
+                'total_pages': 0,
+                'next_cursor': None
             }
     
     def insert_sample_data(self):
@@ -1193,15 +1896,14 @@ class AdminAnalytics:
                 ('+1122334455', 'enterprise', 'admin@company.com', 'Admin User')
             ]
             
-            for phone, tier, email, name in sample_users:
-                try:
-                    self.db.execute_query("""
-                        INSERT INTO users (phone_number, tier, email, full_name, created_at, last_active)
-                        VALUES (%s, %s, %s, %s, NOW(), NOW())
-                        ON CONFLICT (phone_number) DO NOTHING
-                    """, (phone, tier, email, name), fetch='none')
-                except Exception as e:
-                    logger.warning(f"Sample user insert failed: {e}")
+            try:
+                self.db.execute_values("""
+                    INSERT INTO users (phone_number, tier, email, full_name, created_at, last_active)
+                    VALUES %s
+                    ON CONFLICT (phone_number) DO NOTHING
+                """, sample_users, template="(%s, %s, %s, %s, NOW(), NOW())")
+            except Exception as e:
+                logger.warning(f"Sample user insert failed: {e}")
             
             # Insert sample tasks
             sample_tasks = [
@@ -1210,19 +1912,21 @@ class AdminAnalytics:
                 ('+1122334455', 'architecture', 4.8, 'high', 15.3, True, 300, 'Design microservices', 'Architecture designed')
             ]
             
-            for phone, category, complexity, priority, proc_time, success, tokens, request, response in sample_tasks:
-                try:
-                    self.db.execute_query("""
-                        INSERT INTO tasks (user_phone, category, complexity_score, priority, 
-                                         processing_time, success, tokens_used, request_text, response_text,
-                                         created_at, completed_at, task_hash)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW(), %s)
-                    """, (phone, category, complexity, priority, proc_time, success, tokens, 
-                         request, response, hashlib.md5(f"{phone}{request}".encode()).hexdigest()[:16]), 
-                         fetch='none')
-                except Exception as e:
-                    logger.warning(f"Sample task insert failed: {e}")
+            task_rows = [
+                (*task, hashlib.blake2b(f"{task[0]}{task[7]}".encode(), digest_size=8).hexdigest())
+                for task in sample_tasks
+            ]
+            try:
+                self.db.execute_values("""
+                    INSERT INTO tasks (user_phone, category, complexity_score, priority, 
+                                     processing_time, success, tokens_used, request_text, response_text,
+                                     task_hash, created_at, completed_at)
+                    VALUES %s
+                """, task_rows, template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())")
+            except Exception as e:
+                logger.warning(f"Sample task insert failed: {e}")
             
+            invalidate_cache()
             logger.info("Sample data inserted successfully")
             return True
             
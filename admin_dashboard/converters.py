@@ -0,0 +1,18 @@
+"""
+URL path converters for the admin dashboard
+"""
+
+
+class PhoneNumberConverter:
+    """Match stored phone numbers (optional leading +, 7-16 digits)
+
+    core.User.phone_regex allows an optional leading 1 before up to 15
+    digits, so the upper bound here is 16 to reach every valid user.
+    """
+    regex = r'\+?\d{7,16}'
+
+    def to_python(self, value):
+        return value
+
+    def to_url(self, value):
+        return value
@@ -0,0 +1,41 @@
+"""
+Middleware for the admin dashboard
+"""
+import logging
+
+from django.shortcuts import redirect
+
+logger = logging.getLogger(__name__)
+
+# Dashboard routes reachable without an admin session
+PUBLIC_URL_NAMES = frozenset({'login', 'login_explicit', 'logout'})
+
+
+class AdminAuthMiddleware:
+    """Require admin authentication for every admin_dashboard view except login/logout
+
+    The session flag set at login is checked first, so most requests are
+    authorised without loading the Django user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match is None or match.app_name != 'admin_dashboard' or match.url_name in PUBLIC_URL_NAMES:
+            return None
+        
+        # Check simple authentication
+        if request.session.get('admin_authenticated'):
+            return None
+        
+        # Check Django authentication
+        if request.user.is_authenticated and (request.user.is_superuser or request.user.is_staff):
+            return None
+        
+        logger.warning(f"Unauthorized access attempt to {request.path}")
+        return redirect('/dashboard/')
@@ -0,0 +1,130 @@
+import re
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .converters import PhoneNumberConverter
+from .views import decode_users_cursor, encode_users_cursor, local_ttl_cache, merge_tier_rows
+
+
+class PhoneNumberConverterTests(SimpleTestCase):
+    def matches(self, value):
+        return re.fullmatch(PhoneNumberConverter.regex, value) is not None
+
+    def test_accepts_stored_phone_numbers(self):
+        self.assertTrue(self.matches('+15551234567'))
+        self.assertTrue(self.matches('5551234'))
+        # core.User.phone_regex allows a leading 1 before 15 digits
+        self.assertTrue(self.matches('+1' + '2' * 15))
+
+    def test_rejects_other_paths(self):
+        self.assertFalse(self.matches('555123'))
+        self.assertFalse(self.matches('1' * 17))
+        self.assertFalse(self.matches('+1555abc4567'))
+        self.assertFalse(self.matches('broadcast'))
+
+    def test_round_trips_value(self):
+        converter = PhoneNumberConverter()
+        self.assertEqual(converter.to_python('+15551234567'), '+15551234567')
+        self.assertEqual(converter.to_url('+15551234567'), '+15551234567')
+
+
+class UsersCursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        last_active = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+        cursor = encode_users_cursor({'last_active': last_active, 'phone_number': '+15551234567'})
+        self.assertEqual(decode_users_cursor(cursor), (last_active, '+15551234567'))
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_users_cursor({
+            'last_active': datetime(2026, 1, 2, tzinfo=timezone.utc),
+            'phone_number': '+15551234567'
+        })
+        self.assertRegex(cursor, r'^[A-Za-z0-9_=-]+$')
+
+    def test_malformed_cursors_raise_value_error(self):
+        for cursor in ('not base64!', 'bm8tc2VwYXJhdG9y', 'bm90LWEtZGF0ZXwrMTU1NTEyMzQ1Njc='):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    decode_users_cursor(cursor)
+
+
+class MergeTierRowsTests(SimpleTestCase):
+    def test_merges_on_tier_and_sorts(self):
+        user_rows = [{'tier': 'free', 'user_count': 3}, {'tier': 'premium', 'user_count': 1}]
+        task_rows = [{'user_phone__tier': 'premium', 'total_tasks': 10}]
+        task_defaults = {'total_tasks': 0}
+
+        merged = merge_tier_rows(user_rows, task_rows, task_defaults, 'total_tasks')
+
+        self.assertEqual(merged, [
+            {'tier': 'premium', 'user_count': 1, 'total_tasks': 10},
+            {'tier': 'free', 'user_count': 3, 'total_tasks': 0},
+        ])
+        self.assertEqual(task_defaults, {'total_tasks': 0})
+
+    def test_null_sort_values_sort_last(self):
+        user_rows = [{'tier': 'free'}, {'tier': 'premium'}]
+        task_rows = [
+            {'user_phone__tier': 'free', 'avg_time': None},
+            {'user_phone__tier': 'premium', 'avg_time': 1.5},
+        ]
+
+        merged = merge_tier_rows(user_rows, task_rows, {'avg_time': None}, 'avg_time')
+
+        self.assertEqual([row['tier'] for row in merged], ['premium', 'free'])
+
+
+class LocalTtlCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('admin_dashboard.views.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_result_until_expiry(self):
+        func = mock.Mock(side_effect=lambda x: x * 2)
+        cached = local_ttl_cache(10)(func)
+
+        self.assertEqual(cached(2), 4)
+        self.now += 9
+        self.assertEqual(cached(2), 4)
+        self.assertEqual(func.call_count, 1)
+
+        self.now += 1
+        self.assertEqual(cached(2), 4)
+        self.assertEqual(func.call_count, 2)
+
+    def test_evicts_oldest_key_past_maxsize(self):
+        func = mock.Mock(side_effect=lambda x: x)
+        cached = local_ttl_cache(60, maxsize=2)(func)
+
+        cached(1)
+        cached(2)
+        cached(3)
+        self.assertEqual(func.call_count, 3)
+
+        cached(3)
+        cached(2)
+        self.assertEqual(func.call_count, 3)
+        cached(1)
+        self.assertEqual(func.call_count, 4)
+
+    def test_exceptions_are_not_cached(self):
+        func = mock.Mock(side_effect=[RuntimeError('database down'), 'ok'])
+        cached = local_ttl_cache(60)(func)
+
+        with self.assertRaises(RuntimeError):
+            cached()
+        self.assertEqual(cached(), 'ok')
+        self.assertEqual(func.call_count, 2)
+
+    def test_cache_clear(self):
+        func = mock.Mock(return_value='value')
+        cached = local_ttl_cache(60)(func)
+
+        cached()
+        cached.cache_clear()
+        cached()
+        self.assertEqual(func.call_count, 2)
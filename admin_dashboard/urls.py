@@ -1,5 +1,10 @@
-from django.urls import path
+from django.urls import path, register_converter
 from . import views
+from .converters import PhoneNumberConverter
+
+# Only phone-shaped segments reach api_user_details, so the literal
+# broadcast/message/tier routes below it are no longer shadowed
+register_converter(PhoneNumberConverter, 'phone')
 
 app_name = 'admin_dashboard'
 
@@ -19,7 +24,7 @@ urlpatterns = [
     path('api/overview', views.api_overview, name='api_overview'),
     path('api/users', views.api_users, name='api_users'),
     path('api/users/stats', views.api_users_stats, name='api_users_stats'),
-    path('api/users/<str:phone_number>', views.api_user_details, name='api_user_details'),
+    path('api/users/<phone:phone_number>', views.api_user_details, name='api_user_details'),
     path('api/users/broadcast', views.api_users_broadcast, name='api_users_broadcast'),
     path('api/users/message', views.api_users_message, name='api_users_message'),
     path('api/users/tier', views.api_users_tier, name='api_users_tier'),
@@ -1,60 +1,150 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
-from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.utils.decorators import method_decorator
-from django.db.models import Count, Q, Avg, Max, Min, Case, When, IntegerField, FloatField
-from django.db.models.functions import TruncHour, TruncDate
+from django.db.models import Count, Q, Avg, Max, Min, Sum, F, FloatField
+from django.db.models.functions import Cast, ExtractHour, NullIf, Substr, TruncHour, TruncDate
 from django.utils import timezone
 from django.core.paginator import Paginator
 from django.conf import settings
-from datetime import timedelta
+from django.core.cache import cache
+from django.db import connection, connections
+from django.utils.functional import cached_property
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as dt_time, timedelta
+from collections import defaultdict
+from functools import lru_cache, wraps
+from operator import itemgetter
+import base64
+import binascii
+import csv
+import hashlib
 import json
 import logging
 import os
+import threading
+import time
 from django.core.serializers.json import DjangoJSONEncoder
 
-from core.models import User, Task, ErrorLog
+from core.activity import RedisError, count_active_users
+from core.models import User, Task, ErrorLog, TaskDailyRollup
+
+try:
+    import orjson
+except ImportError:  # optional; IsoJSONEncoder is used instead
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
-class DateTimeAwareJSONResponse(JsonResponse):
-    """Custom JsonResponse that handles datetime objects"""
-    def __init__(self, data, **kwargs):
-        # Use Django's native encoder parameter approach
-        if 'encoder' not in kwargs:
-            kwargs['encoder'] = DjangoJSONEncoder
-        super().__init__(data, **kwargs)
+class IsoJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder that writes dates and times exactly as orjson does
 
+    DjangoJSONEncoder cuts datetimes to milliseconds and writes UTC as "Z";
+    full isoformat() output, with naive datetimes marked UTC like orjson's
+    OPT_NAIVE_UTC, keeps responses identical whether or not orjson is installed.
+    """
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat() if o.tzinfo else o.isoformat() + '+00:00'
+        if isinstance(o, (date, dt_time)):
+            return o.isoformat()
+        return super().default(o)
 
-def serialize_datetime(obj):
-    """Helper function to serialize datetime objects"""
-    if hasattr(obj, 'isoformat'):
-        return obj.isoformat()
-    return obj
 
+# Fallback for types orjson does not encode itself; built once, not per response
+_json_default = IsoJSONEncoder().default
 
-def serialize_queryset_datetime(queryset_values):
-    """Helper function to serialize datetime objects in queryset values"""
-    result = []
-    for item in queryset_values:
-        serialized_item = {}
-        for key, value in item.items():
-            if hasattr(value, 'isoformat'):  # datetime object
-                serialized_item[key] = value.isoformat()
-            else:
-                serialized_item[key] = value
-        result.append(serialized_item)
-    return result
 
+def dumps_json(data, encoder=IsoJSONEncoder):
+    """Serialize `data` to JSON bytes, with orjson when it is installed.
 
-# Authentication views
-from django.views.decorators.csrf import csrf_protect
-from django.contrib.auth.models import User as DjangoUser
+    orjson encodes date/datetime natively in C; anything else it does not
+    know (Decimal, UUID, lazy strings) falls back to `encoder`.
+    """
+    if orjson is not None:
+        default = _json_default if encoder is IsoJSONEncoder else encoder().default
+        return orjson.dumps(
+            data,
+            default=default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, cls=encoder).encode()
+
+
+def iter_json_object(data, encoder=IsoJSONEncoder):
+    """Yield the JSON encoding of dict `data` one top-level member at a time"""
+    separator = b'{'
+    for key, value in data.items():
+        yield separator + dumps_json(key, encoder) + b':' + dumps_json(value, encoder)
+        separator = b','
+    yield b'}' if separator == b',' else b'{}'
+
+
+class Echo:
+    """File-like object whose write() hands the value back, for streaming csv.writer output"""
+    def write(self, value):
+        return value
+
+
+class DateTimeAwareJSONResponse(HttpResponse):
+    """JSON response that handles datetime objects"""
+    def __init__(self, data, encoder=IsoJSONEncoder, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(dumps_json(data, encoder), **kwargs)
+
+
+def merge_tier_rows(user_rows, task_rows, task_defaults, sort_key):
+    """Merge per-tier user and task aggregates computed in separate queries.
+
+    Annotating users with task aggregates in one query joins every user to
+    every one of their tasks, so each side is grouped on its own and the two
+    small result sets are joined here on ``tier``.
+    """
+    task_by_tier = {row.pop('user_phone__tier'): row for row in task_rows}
+    merged = [
+        {**row, **task_by_tier.get(row['tier'], task_defaults)}
+        for row in user_rows
+    ]
+    merged.sort(key=lambda row: row[sort_key] or 0, reverse=True)
+    return merged
+
+
+def with_success_rate(rows):
+    """Replace each row's ``successful`` count with a ``success_rate`` percentage of ``count``"""
+    rows = list(rows)
+    for row in rows:
+        successful = row.pop('successful')
+        row['success_rate'] = successful * 100.0 / row['count'] if row['count'] else 0
+    return rows
+
+
+def query_params(request, **spec):
+    """Parse and clamp GET parameters declared as ``name=(type, default, low, high)``
 
+    Missing or malformed values fall back to the default, and values outside
+    the bounds are clamped so no request can ask for an unbounded window.
+    """
+    params = {}
+    for name, (cast, default, low, high) in spec.items():
+        try:
+            value = cast(request.GET.get(name, default))
+        except (TypeError, ValueError):
+            value = default
+        params[name] = max(low, min(high, value))
+    return params
+
+
+# Bounds shared by the views that accept these parameters
+PAGE_PARAM = (int, 1, 1, 10 ** 6)
+DAYS_PARAM = (int, 30, 1, 365)
+HOURS_PARAM = (int, 24, 1, 24 * 30)
+
+
+# Authentication views
 @csrf_protect
 @require_http_methods(["GET", "POST"])
 def admin_login(request):
@@ -103,65 +193,35 @@ def admin_logout(request):
     return redirect('/dashboard/')
 
 
-def require_admin_auth(view_func):
-    """Decorator to require admin authentication"""
-    def wrapper(request, *args, **kwargs):
-        # Check Django authentication
-        if request.user.is_authenticated and (request.user.is_superuser or request.user.is_staff):
-            return view_func(request, *args, **kwargs)
-        
-        # Check simple authentication
-        if request.session.get('admin_authenticated'):
-            return view_func(request, *args, **kwargs)
-        
-        logger.warning(f"Unauthorized access attempt to {request.path}")
-        return redirect('/dashboard/')
-    return wrapper
+def run_with_own_connection(func, *args):
+    """Call `func` from a worker thread, closing the thread's DB connections after"""
+    try:
+        return func(*args)
+    finally:
+        connections.close_all()
 
 
 # Dashboard views
-@require_admin_auth
 def dashboard(request):
     """Main admin dashboard"""
     try:
-        # Get overview statistics using Django ORM
-        total_users = User.objects.count()
-        total_tasks = Task.objects.count()
-        
-        # Tasks in last 24 hours
-        yesterday = timezone.now() - timedelta(days=1)
-        tasks_24h = Task.objects.filter(created_at__gte=yesterday).count()
-        
-        # Active users (last 7 days)
-        week_ago = timezone.now() - timedelta(days=7)
-        active_users = User.objects.filter(last_active__gte=week_ago).count()
-        
-        # Success rate
-        successful_tasks = Task.objects.filter(success=True).count()
-        success_rate = (successful_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        # Recent errors
-        recent_errors = ErrorLog.objects.filter(timestamp__gte=yesterday).count()
-        
-        overview = {
-            'total_users': total_users,
-            'total_tasks': total_tasks,
-            'tasks_24h': tasks_24h,
-            'active_users': active_users,
-            'success_rate': round(success_rate, 2),
-            'recent_errors': recent_errors
-        }
-        
-        # Get user analytics for last 7 days
-        user_analytics = get_user_analytics_data(7)
-        task_analytics = get_task_analytics_data(7)
-        system_health = get_system_health_data()
+        # The helpers are independent, so run them side by side on separate
+        # connections; page latency becomes the slowest one, not their sum
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            overview_future = executor.submit(run_with_own_connection, get_overview_data)
+            user_future = executor.submit(run_with_own_connection, get_user_analytics_data, 7)
+            task_future = executor.submit(run_with_own_connection, get_task_analytics_data, 7)
+            health_future = executor.submit(run_with_own_connection, get_system_health_data)
+        overview = overview_future.result()
+        user_analytics = user_future.result()
+        task_analytics = task_future.result()
+        system_health = health_future.result()
         
         context = {
-            'overview': json.dumps(overview, cls=DjangoJSONEncoder),
+            'overview': overview,
             'user_analytics': user_analytics,
             'task_analytics': task_analytics,
-            'system_health': json.dumps(system_health, cls=DjangoJSONEncoder)
+            'system_health': system_health
         }
         
         return render(request, 'admin/dashboard.html', context)
@@ -171,15 +231,21 @@ def dashboard(request):
         return render(request, 'admin/dashboard.html', {'error': 'Failed to load dashboard data'})
 
 
-@require_admin_auth
 def users_view(request):
     """User management page"""
-    page = int(request.GET.get('page', 1))
+    page = query_params(request, page=PAGE_PARAM)['page']
     search = request.GET.get('search', '')
     tier_filter = request.GET.get('tier', '')
+    cursor = request.GET.get('cursor')
+    
+    try:
+        after = decode_users_cursor(cursor) if cursor else None
+    except ValueError:
+        after = None  # Fall back to page-number pagination
     
     try:
-        users_data = get_users_list_data(page=page, per_page=20, search=search, tier_filter=tier_filter)
+        users_data = get_users_list_data(page=page, per_page=20, search=search, tier_filter=tier_filter,
+                                         after=after)
         
         context = {
             'users_data': users_data,
@@ -194,10 +260,9 @@ def users_view(request):
         return render(request, 'admin/users.html', {'error': 'Failed to load users data'})
 
 
-@require_admin_auth
 def analytics_view(request):
     """Analytics and reporting page"""
-    days = int(request.GET.get('days', 30))
+    days = query_params(request, days=DAYS_PARAM)['days']
     
     try:
         user_analytics = get_user_analytics_data(days)
@@ -216,15 +281,14 @@ def analytics_view(request):
         return render(request, 'admin/analytics.html', {'error': 'Failed to load analytics data'})
 
 
-@require_admin_auth
 def system_view(request):
     """System monitoring and configuration"""
     try:
         system_health = get_system_health_data()
         overview = {
-            'total_users': User.objects.count(),
-            'total_tasks': Task.objects.count(),
-            'total_errors': ErrorLog.objects.count()
+            'total_users': fast_count(User),
+            'total_tasks': fast_count(Task),
+            'total_errors': fast_count(ErrorLog)
         }
         
         context = {
@@ -240,33 +304,11 @@ def system_view(request):
 
 
 # API endpoints for AJAX calls
-@require_admin_auth
 def api_overview(request):
     """API endpoint for dashboard overview"""
     try:
-        total_users = User.objects.count()
-        total_tasks = Task.objects.count()
-        
-        yesterday = timezone.now() - timedelta(days=1)
-        tasks_24h = Task.objects.filter(created_at__gte=yesterday).count()
-        
-        week_ago = timezone.now() - timedelta(days=7)
-        active_users = User.objects.filter(last_active__gte=week_ago).count()
-        
-        successful_tasks = Task.objects.filter(success=True).count()
-        success_rate = (successful_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        recent_errors = ErrorLog.objects.filter(timestamp__gte=yesterday).count()
-        
-        data = {
-            'total_users': total_users,
-            'total_tasks': total_tasks,
-            'tasks_24h': tasks_24h,
-            'active_users': active_users,
-            'success_rate': round(success_rate, 2),
-            'recent_errors': recent_errors,
-            'timestamp': timezone.now().isoformat()
-        }
+        data = get_overview_data()
+        data['timestamp'] = timezone.now().isoformat()
         
         return DateTimeAwareJSONResponse(data)
         
@@ -275,16 +317,24 @@ def api_overview(request):
         return DateTimeAwareJSONResponse({'error': 'Failed to fetch overview data'}, status=500)
 
 
-@require_admin_auth
 def api_users(request):
     """API endpoint for users data with pagination and search"""
-    page = int(request.GET.get('page', 1))
-    per_page = int(request.GET.get('per_page', 20))
+    params = query_params(request, page=PAGE_PARAM, per_page=(int, 20, 1, 100))
+    page, per_page = params['page'], params['per_page']
     search = request.GET.get('search', '')
     tier_filter = request.GET.get('tier', '')
+    cursor = request.GET.get('cursor')
+    # Infinite-scroll clients can skip the total entirely
+    include_count = request.GET.get('include_count', 'true').lower() != 'false'
+    
+    try:
+        after = decode_users_cursor(cursor) if cursor else None
+    except ValueError:
+        return DateTimeAwareJSONResponse({'error': 'Invalid cursor'}, status=400)
     
     try:
-        users_data = get_users_list_data(page=page, per_page=per_page, search=search, tier_filter=tier_filter)
+        users_data = get_users_list_data(page=page, per_page=per_page, search=search, tier_filter=tier_filter,
+                                         after=after, include_count=include_count)
         return DateTimeAwareJSONResponse(users_data)
         
     except Exception as e:
@@ -292,12 +342,11 @@ def api_users(request):
         return DateTimeAwareJSONResponse({'error': 'Failed to fetch users data'}, status=500)
 
 
-@require_admin_auth
 def api_users_stats(request):
     """API endpoint for user statistics"""
     try:
         # Get user statistics using Django ORM
-        total_users = User.objects.count()
+        total_users = fast_count(User)
         free_users = User.objects.filter(tier='free').count()
         premium_users = User.objects.filter(tier='premium').count()
         enterprise_users = User.objects.filter(tier='enterprise').count()
@@ -324,20 +373,20 @@ def api_users_stats(request):
             'active_30d': active_30d
         }
         
-        # User growth over time (last 30 days) - serialize datetime properly
-        growth_data_raw = User.objects.filter(created_at__gte=month_ago).extra({'date': "date(created_at)"}).values('date').annotate(new_users=Count('phone_number')).order_by('date')
-        growth_data = serialize_queryset_datetime(growth_data_raw)
+        # User growth over time (last 30 days)
+        growth_data_raw = User.objects.filter(created_at__gte=month_ago).annotate(date=TruncDate('created_at')).values('date').annotate(new_users=Count('phone_number')).order_by('date')
+        growth_data = list(growth_data_raw)
         
         # User activity by tier
-        tier_activity = list(
-            User.objects.values('tier')
-            .annotate(
-                user_count=Count('phone_number'),
-                total_tasks=Count('tasks'),
-                avg_processing_time=Avg('tasks__processing_time'),
-                successful_tasks=Count('tasks', filter=Q(tasks__success=True))
-            )
-            .order_by('-user_count')
+        tier_activity = merge_tier_rows(
+            User.objects.values('tier').annotate(user_count=Count('phone_number')).order_by(),
+            Task.objects.values('user_phone__tier').annotate(
+                total_tasks=Count('id'),
+                avg_processing_time=Avg('processing_time'),
+                successful_tasks=Count('id', filter=Q(success=True))
+            ).order_by(),
+            {'total_tasks': 0, 'avg_processing_time': None, 'successful_tasks': 0},
+            'user_count'
         )
         
         data = {
@@ -355,8 +404,218 @@ def api_users_stats(request):
 
 
 # Helper functions using Django ORM
-def get_users_list_data(page=1, per_page=20, search='', tier_filter=''):
-    """Get paginated users list with search and filtering using Django ORM"""
+def fast_count(model):
+    """Approximate row count of `model`'s table from the planner statistics
+
+    pg_class.reltuples is kept current by autovacuum/ANALYZE and is read
+    without scanning the table. Falls back to an exact COUNT(*) on other
+    databases and for tables that have never been analyzed.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+    return model.objects.count()
+
+
+# Error lists only show a preview, so long messages and tracebacks stay in the database
+ERROR_PREVIEW = Substr('error_message', 1, 200)
+
+# Aggregates over task_daily_rollup rows, so the dashboard reads the small
+# materialized view instead of scanning every task
+ROLLUP_TOTAL_TASKS = Sum('total')
+ROLLUP_SUCCESSFUL_TASKS = Sum('successful')
+ROLLUP_AVG_PROCESSING_TIME = Sum('processing_time_sum') / NullIf(Sum('processing_time_count'), 0)
+ROLLUP_SUCCESS_RATE = Cast(Sum('successful'), FloatField()) * 100 / NullIf(Sum('total'), 0)
+
+
+def get_daily_task_stats(days):
+    """Per-day task totals for the last `days` days from the rollup view"""
+    start_day = (timezone.now() - timedelta(days=days)).date()
+    return list(
+        TaskDailyRollup.objects.filter(day__gte=start_day)
+        .values(date=F('day'))
+        .annotate(
+            total_tasks=ROLLUP_TOTAL_TASKS,
+            successful_tasks=ROLLUP_SUCCESSFUL_TASKS,
+            avg_processing_time=ROLLUP_AVG_PROCESSING_TIME
+        )
+        .order_by('date')
+    )
+
+
+def get_task_totals():
+    """All-time task count, success rate and average processing time from the rollup view"""
+    totals = TaskDailyRollup.objects.aggregate(
+        total=ROLLUP_TOTAL_TASKS,
+        success_rate=ROLLUP_SUCCESS_RATE,
+        avg_processing_time=ROLLUP_AVG_PROCESSING_TIME
+    )
+    return {
+        'total_tasks': totals['total'] or 0,
+        'success_rate': totals['success_rate'] or 0,
+        'avg_processing_time': totals['avg_processing_time'] or 0
+    }
+
+
+OVERVIEW_CACHE_SECONDS = 30
+HEALTH_CACHE_SECONDS = 15
+ANALYTICS_CACHE_SECONDS = 60
+
+
+def local_ttl_cache(seconds, maxsize=1024):
+    """Memoize a helper in this process for `seconds`, keyed by its arguments
+
+    Sits in front of the shared cache for endpoints polled every few
+    seconds. Exceptions propagate and are not cached; once `maxsize` keys
+    are held the oldest entry is dropped.
+    """
+    def decorator(func):
+        entries = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            entry = entries.get(args)
+            if entry is not None and now - entry[0] < seconds:
+                return entry[1]
+            result = func(*args)
+            with lock:
+                entries[args] = (now, result)
+                if len(entries) > maxsize:
+                    entries.pop(next(iter(entries)))
+            return result
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+
+def cache_get_or_set(key, default, seconds):
+    """Like cache.get_or_set(), but calls `default` directly while Redis is unreachable
+
+    The dashboard keeps working (uncached) through a Redis outage instead of
+    every cached view failing with a 500.
+    """
+    try:
+        value = cache.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return default()
+    if value is None:
+        value = default()
+        try:
+            cache.set(key, value, seconds)
+        except RedisError as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+    return value
+
+
+def cached_helper(seconds, fallback=None):
+    """Memoize a data helper in the Django cache, keyed by name and arguments
+
+    With `fallback`, an exception from the helper is logged and
+    ``fallback(exception)`` is returned instead. The fallback is never
+    cached, so the next call queries the database again.
+    """
+    def decorator(func):
+        def cache_key(*args):
+            return ':'.join(['admin_dashboard', func.__name__, *map(str, args)])
+
+        @wraps(func)
+        def wrapper(*args):
+            try:
+                return cache_get_or_set(cache_key(*args), lambda: func(*args), seconds)
+            except Exception as e:
+                if fallback is None:
+                    raise
+                logger.error(f"Error in {func.__name__}: {e}")
+                return fallback(e)
+        wrapper.cache_key = cache_key
+        return wrapper
+    return decorator
+
+
+@cached_helper(OVERVIEW_CACHE_SECONDS)
+def get_overview_data():
+    """Get dashboard overview counts; all-time totals come from the rollup view and table statistics"""
+    now = timezone.now()
+    yesterday = now - timedelta(days=1)
+    week_ago = now - timedelta(days=7)
+    
+    active_users = User.objects.filter(last_active__gte=week_ago).count()
+    task_totals = get_task_totals()
+    tasks_24h = Task.objects.filter(created_at__gte=yesterday).count()
+    recent_errors = ErrorLog.objects.filter(timestamp__gte=yesterday).count()
+    
+    return {
+        'total_users': fast_count(User),
+        'total_tasks': task_totals['total_tasks'],
+        'tasks_24h': tasks_24h,
+        'active_users': active_users,
+        'success_rate': round(task_totals['success_rate'], 2),
+        'recent_errors': recent_errors
+    }
+
+
+# Filtered user totals for the users list are reused for this long
+USERS_COUNT_CACHE_SECONDS = 60
+
+
+def users_count_cache_key(search, tier_filter):
+    """Cache key of the users-list total for one search/tier filter combination"""
+    filters_key = hashlib.blake2b(f"{search}|{tier_filter}".encode(), digest_size=8).hexdigest()
+    return f"admin_dashboard:users_count:{filters_key}"
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator whose total comes from a cheaper, briefly cached count query"""
+    
+    def __init__(self, object_list, per_page, count_queryset, cache_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_queryset = count_queryset
+        self.cache_key = cache_key
+    
+    @cached_property
+    def count(self):
+        return cache_get_or_set(self.cache_key, self.count_queryset.count, USERS_COUNT_CACHE_SECONDS)
+
+
+def encode_users_cursor(user):
+    """Opaque keyset cursor pointing just past the `user` row in the users list order"""
+    raw = f"{user['last_active'].isoformat()}|{user['phone_number']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_users_cursor(cursor):
+    """Return (last_active, phone_number) from a users list cursor; ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        last_active, phone_number = raw.split('|', 1)
+        return datetime.fromisoformat(last_active), phone_number
+    except (UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(f"Malformed cursor: {e}")
+
+
+# Row columns for the users list; dates stay native and are encoded with the response
+USERS_LIST_FIELDS = (
+    'phone_number', 'tier', 'email', 'full_name', 'created_at', 'last_active',
+    'total_requests', 'monthly_requests', 'task_count', 'last_task'
+)
+
+
+def get_users_list_data(page=1, per_page=20, search='', tier_filter='', after=None, include_count=True):
+    """Get paginated users list with search and filtering using Django ORM
+    
+    Pass ``after`` (a decoded ``next_cursor``) to seek past the previous page
+    instead of using OFFSET; page numbers are still accepted for the users page.
+    With ``include_count=False`` the total (and total_pages) is not computed.
+    """
     try:
         # Build queryset with filters
         queryset = User.objects.all()
@@ -371,35 +630,45 @@ def get_users_list_data(page=1, per_page=20, search='', tier_filter=''):
         if tier_filter:
             queryset = queryset.filter(tier=tier_filter)
         
-        # Add task count annotation
+        # Count users without the tasks join the annotations below add
+        count_queryset = queryset.order_by().values('pk')
+        
+        # Add task count annotation; phone_number breaks last_active ties so
+        # the keyset cursor never skips or repeats a user
         queryset = queryset.annotate(
             task_count=Count('tasks'),
             last_task=Max('tasks__created_at')
-        ).order_by('-last_active')
-        
-        # Paginate
-        paginator = Paginator(queryset, per_page)
-        users_page = paginator.get_page(page)
-        
-        # Convert to list of dictionaries with proper datetime serialization
-        users_list = []
-        for user in users_page:
-            users_list.append({
-                'phone_number': user.phone_number,
-                'tier': user.tier,
-                'email': user.email,
-                'full_name': user.full_name,
-                'created_at': user.created_at.isoformat() if user.created_at else None,
-                'last_active': user.last_active.isoformat() if user.last_active else None,
-                'total_requests': user.total_requests,
-                'monthly_requests': user.monthly_requests,
-                'task_count': user.task_count,
-                'last_task': user.last_task.isoformat() if user.last_task else None,
-            })
-        
-        return {
-            'users': users_list,
-            'pagination': {
+        ).order_by('-last_active', 'phone_number').values(*USERS_LIST_FIELDS)
+        
+        if after is not None:
+            last_active, phone_number = after
+            rows = list(queryset.filter(
+                Q(last_active__lt=last_active) |
+                Q(last_active=last_active, phone_number__gt=phone_number)
+            )[:per_page + 1])
+            users = rows[:per_page]
+            pagination = {
+                'per_page': per_page,
+                'has_prev': True,
+                'has_next': len(rows) > per_page
+            }
+        elif not include_count:
+            offset = (max(page, 1) - 1) * per_page
+            rows = list(queryset[offset:offset + per_page + 1])
+            users = rows[:per_page]
+            pagination = {
+                'page': page,
+                'per_page': per_page,
+                'has_prev': page > 1,
+                'has_next': len(rows) > per_page
+            }
+        else:
+            # Paginate
+            paginator = CachedCountPaginator(queryset, per_page, count_queryset,
+                                             cache_key=users_count_cache_key(search, tier_filter))
+            users_page = paginator.get_page(page)
+            users = list(users_page)
+            pagination = {
                 'total': paginator.count,
                 'page': page,
                 'per_page': per_page,
@@ -407,6 +676,11 @@ def get_users_list_data(page=1, per_page=20, search='', tier_filter=''):
                 'has_prev': users_page.has_previous(),
                 'has_next': users_page.has_next()
             }
+        pagination['next_cursor'] = encode_users_cursor(users[-1]) if pagination['has_next'] else None
+        
+        return {
+            'users': users,
+            'pagination': pagination
         }
         
     except Exception as e:
@@ -419,195 +693,224 @@ def get_users_list_data(page=1, per_page=20, search='', tier_filter=''):
                 'per_page': per_page,
                 'total_pages': 0,
                 'has_prev': False,
-                'has_next': False
+                'has_next': False,
+                'next_cursor': None
             }
         }
 
 
+@cached_helper(ANALYTICS_CACHE_SECONDS, fallback=lambda e: {'user_trends': [], 'tier_activity': []})
 def get_user_analytics_data(days=30):
     """Get user analytics data using Django ORM"""
-    try:
-        start_date = timezone.now() - timedelta(days=days)
-        
-        # User registration trends - serialize datetime properly
-        user_trends_raw = User.objects.filter(created_at__gte=start_date).extra({'date': "date(created_at)"}).values('date').annotate(new_users=Count('phone_number')).order_by('date')
-        user_trends = serialize_queryset_datetime(user_trends_raw)
-        
-        # User activity by tier
-        tier_activity = list(
-            User.objects.values('tier')
-            .annotate(
-                task_count=Count('tasks', filter=Q(tasks__created_at__gte=start_date)),
-                active_users=Count('phone_number', filter=Q(last_active__gte=start_date))
-            )
-            .order_by('-active_users')
-        )
-        
-        return {
-            'user_trends': user_trends,
-            'tier_activity': tier_activity
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting user analytics: {e}")
-        return {'user_trends': [], 'tier_activity': []}
+    start_date = timezone.now() - timedelta(days=days)
+    
+    # User registration trends
+    user_trends_raw = User.objects.filter(created_at__gte=start_date).annotate(date=TruncDate('created_at')).values('date').annotate(new_users=Count('phone_number')).order_by('date')
+    user_trends = list(user_trends_raw)
+    
+    # User activity by tier
+    tier_activity = merge_tier_rows(
+        User.objects.values('tier').annotate(
+            active_users=Count('phone_number', filter=Q(last_active__gte=start_date))
+        ).order_by(),
+        Task.objects.filter(created_at__gte=start_date)
+        .values('user_phone__tier').annotate(task_count=Count('id')).order_by(),
+        {'task_count': 0},
+        'active_users'
+    )
+    
+    return {
+        'user_trends': user_trends,
+        'tier_activity': tier_activity
+    }
 
 
+@cached_helper(ANALYTICS_CACHE_SECONDS, fallback=lambda e: {'task_trends': [], 'category_stats': []})
 def get_task_analytics_data(days=30):
     """Get task analytics data using Django ORM"""
-    try:
-        start_date = timezone.now() - timedelta(days=days)
-        
-        # Task trends over time - serialize datetime properly
-        task_trends_raw = Task.objects.filter(created_at__gte=start_date).extra({'date': "date(created_at)"}).values('date').annotate(
-            total_tasks=Count('id'),
-            successful_tasks=Count('id', filter=Q(success=True)),
-            avg_time=Avg('processing_time')
-        ).order_by('date')
-        task_trends = serialize_queryset_datetime(task_trends_raw)
-        
-        # Task categories
-        from django.db.models import FloatField, Case, When, IntegerField
-        category_stats = list(
-            Task.objects.filter(created_at__gte=start_date)
-            .values('category')
-            .annotate(
-                count=Count('id'),
-                avg_processing_time=Avg('processing_time'),
-                success_rate=Avg(
-                    Case(
-                        When(success=True, then=1),
-                        default=0,
-                        output_field=IntegerField()
-                    ),
-                    output_field=FloatField()
-                ) * 100
-            )
-            .order_by('-count')
+    start_day = (timezone.now() - timedelta(days=days)).date()
+    rollup = TaskDailyRollup.objects.filter(day__gte=start_day)
+    
+    # Task trends over time
+    task_trends = list(
+        rollup.values(date=F('day'))
+        .annotate(
+            total_tasks=ROLLUP_TOTAL_TASKS,
+            successful_tasks=ROLLUP_SUCCESSFUL_TASKS,
+            avg_time=ROLLUP_AVG_PROCESSING_TIME
         )
-        
-        return {
-            'task_trends': task_trends,
-            'category_stats': category_stats
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting task analytics: {e}")
-        return {'task_trends': [], 'category_stats': []}
+        .order_by('date')
+    )
+    
+    # Task categories
+    category_stats = list(
+        rollup.values('category')
+        .annotate(
+            count=ROLLUP_TOTAL_TASKS,
+            avg_processing_time=ROLLUP_AVG_PROCESSING_TIME,
+            success_rate=ROLLUP_SUCCESS_RATE
+        )
+        .order_by('-count')
+    )
+    
+    return {
+        'task_trends': task_trends,
+        'category_stats': category_stats
+    }
+
 
+def system_health_fallback(error):
+    """System health payload reported while the database cannot be queried"""
+    return {
+        'database_connected': False,
+        'database_health': {
+            'status': 'error',
+            'connected': False
+        },
+        'slow_tasks_count': 0,
+        'error_stats': [],
+        'overall_status': 'error',
+        'error': str(error),
+        'timestamp': timezone.now().isoformat()
+    }
 
+
+@cached_helper(ANALYTICS_CACHE_SECONDS, fallback=system_health_fallback)
 def get_system_health_data():
     """Get system health data using Django ORM"""
-    try:
-        yesterday = timezone.now() - timedelta(days=1)
-        
-        # Check for slow tasks (processing time > 30 seconds)
-        slow_tasks_count = Task.objects.filter(
-            created_at__gte=yesterday,
-            processing_time__gt=30
-        ).count()
-        
-        # Get recent error statistics
-        error_stats = list(
-            ErrorLog.objects.filter(timestamp__gte=yesterday)
-            .values('error_type')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:5]
+    yesterday = timezone.now() - timedelta(days=1)
+    
+    # Check for slow tasks (processing time > 30 seconds)
+    slow_tasks_count = Task.objects.filter(
+        created_at__gte=yesterday,
+        processing_time__gt=30
+    ).count()
+    
+    # Get recent error statistics
+    error_stats = list(
+        ErrorLog.objects.filter(timestamp__gte=yesterday)
+        .values('error_type')
+        .annotate(count=Count('id'))
+        .order_by('-count')[:5]
+    )
+    
+    # Get recent errors
+    recent_errors_raw = ErrorLog.objects.filter(timestamp__gte=yesterday).order_by('-timestamp').values('id', 'error_type', 'timestamp', 'user_phone', error_preview=ERROR_PREVIEW)[:10]
+    recent_errors = list(recent_errors_raw)
+    
+    task_totals = get_task_totals()
+    
+    # Basic health metrics in the format expected by JavaScript
+    health_data = {
+        'database_connected': True,  # If we're here, DB is connected
+        'database_health': {
+            'status': 'healthy',
+            'connected': True
+        },
+        'slow_tasks_count': slow_tasks_count,
+        'error_stats': error_stats,
+        'total_users': fast_count(User),
+        'total_tasks': task_totals['total_tasks'],
+        'tasks_24h': Task.objects.filter(created_at__gte=yesterday).count(),
+        'errors_24h': ErrorLog.objects.filter(timestamp__gte=yesterday).count(),
+        'avg_processing_time': task_totals['avg_processing_time'],
+        'success_rate': task_totals['success_rate'],
+        'recent_errors': recent_errors,
+        'timestamp': timezone.now().isoformat(),
+        'overall_status': 'healthy' if slow_tasks_count < 10 and len(error_stats) < 5 else 'warning'
+    }
+    
+    return health_data
+
+
+# Missing API endpoints referenced in URLs
+def summarize_task_window(start_date):
+    """Category, tier and peak-hour task stats since `start_date` from a single query
+
+    Tasks are grouped once by (category, tier, hour) with additive
+    aggregates; the per-category, per-tier and per-hour breakdowns are then
+    folded from those few hundred rows in Python.
+    """
+    rows = (
+        Task.objects.filter(created_at__gte=start_date)
+        .values('category', 'user_phone__tier', hour=ExtractHour('created_at'))
+        .annotate(
+            count=Count('id'),
+            successful=Count('id', filter=Q(success=True)),
+            time_sum=Sum('processing_time'),
+            time_count=Count('processing_time'),
+            complexity_sum=Sum('complexity_score')
         )
-        
-        # Get recent errors with proper datetime serialization
-        recent_errors_raw = ErrorLog.objects.filter(timestamp__gte=yesterday).order_by('-timestamp')[:10].values('id', 'error_type', 'error_message', 'timestamp', 'user_phone')
-        recent_errors = serialize_queryset_datetime(recent_errors_raw)
-        
-        # Basic health metrics in the format expected by JavaScript
-        health_data = {
-            'database_connected': True,  # If we're here, DB is connected
-            'database_health': {
-                'status': 'healthy',
-                'connected': True
-            },
-            'slow_tasks_count': slow_tasks_count,
-            'error_stats': error_stats,
-            'total_users': User.objects.count(),
-            'total_tasks': Task.objects.count(),
-            'tasks_24h': Task.objects.filter(created_at__gte=yesterday).count(),
-            'errors_24h': ErrorLog.objects.filter(timestamp__gte=yesterday).count(),
-            'avg_processing_time': Task.objects.aggregate(avg_time=Avg('processing_time'))['avg_time'] or 0,
-            'success_rate': (Task.objects.filter(success=True).count() / max(Task.objects.count(), 1)) * 100,
-            'recent_errors': recent_errors,
-            'timestamp': timezone.now().isoformat(),
-            'overall_status': 'healthy' if slow_tasks_count < 10 and len(error_stats) < 5 else 'warning'
-        }
-        
-        return health_data
-        
-    except Exception as e:
-        logger.error(f"Error getting system health: {e}")
-        return {
-            'database_connected': False,
-            'database_health': {
-                'status': 'error',
-                'connected': False
-            },
-            'slow_tasks_count': 0,
-            'error_stats': [],
-            'overall_status': 'error',
-            'error': str(e),
-            'timestamp': timezone.now().isoformat()
+        .order_by()
+    )
+    
+    fields = ('count', 'successful', 'time_sum', 'time_count', 'complexity_sum')
+    by_category = defaultdict(lambda: dict.fromkeys(fields, 0))
+    by_tier = defaultdict(lambda: dict.fromkeys(fields, 0))
+    by_hour = defaultdict(int)
+    for row in rows:
+        for totals in (by_category[row['category']], by_tier[row['user_phone__tier']]):
+            for field in fields:
+                totals[field] += row[field] or 0
+        by_hour[row['hour']] += row['count']
+    
+    def avg_time(totals):
+        return totals['time_sum'] / totals['time_count'] if totals['time_count'] else None
+    
+    category_stats = with_success_rate(
+        {
+            'category': category,
+            'count': totals['count'],
+            'avg_processing_time': avg_time(totals),
+            'successful': totals['successful'],
+            'avg_complexity': totals['complexity_sum'] / totals['count'] if totals['count'] else None
         }
+        for category, totals in by_category.items()
+    )
+    category_stats.sort(key=itemgetter('count'), reverse=True)
+    
+    tier_stats = [
+        {'user_phone__tier': tier, 'task_count': totals['count'], 'avg_processing_time': avg_time(totals)}
+        for tier, totals in by_tier.items()
+    ]
+    
+    peak_hour_stats = [
+        {'hour': hour, 'task_count': count}
+        for hour, count in sorted(by_hour.items(), key=itemgetter(1), reverse=True)[:5]
+    ]
+    
+    overall_time_sum = sum(totals['time_sum'] for totals in by_category.values())
+    overall_time_count = sum(totals['time_count'] for totals in by_category.values())
+    
+    return {
+        'category_stats': category_stats,
+        'tier_stats': tier_stats,
+        'peak_hour_stats': peak_hour_stats,
+        'avg_response_time': overall_time_sum / overall_time_count if overall_time_count else 0
+    }
 
 
-# Missing API endpoints referenced in URLs
-@require_admin_auth
 def api_analytics_detailed(request):
     """API endpoint for detailed analytics"""
     try:
-        days = int(request.GET.get('days', 30))
+        days = query_params(request, days=DAYS_PARAM)['days']
         start_date = timezone.now() - timedelta(days=days)
         
-        # Daily stats for the date range - serialize datetime properly
-        daily_stats_raw = Task.objects.filter(created_at__gte=start_date).extra({'date': "date(created_at)"}).values('date').annotate(
-            total_tasks=Count('id'),
-            successful_tasks=Count('id', filter=Q(success=True)),
-            avg_processing_time=Avg('processing_time')
-        ).order_by('date')
-        daily_stats = serialize_queryset_datetime(daily_stats_raw)
+        # Daily stats for the date range
+        daily_stats = get_daily_task_stats(days)
         
-        # Tier analysis
-        tier_analysis = list(
-            User.objects.values('tier')
-            .annotate(
-                user_count=Count('phone_number'),
-                task_count=Count('tasks', filter=Q(tasks__created_at__gte=start_date)),
-                avg_processing_time=Avg('tasks__processing_time', filter=Q(tasks__created_at__gte=start_date))
-            )
-            .order_by('-user_count')
-        )
+        # Category, tier, peak-hour and overall figures all come from one
+        # grouped scan of the window's tasks
+        window = summarize_task_window(start_date)
         
-        # Category stats
-        category_stats = list(
-            Task.objects.filter(created_at__gte=start_date)
-            .values('category')
-            .annotate(
-                count=Count('id'),
-                avg_processing_time=Avg('processing_time'),
-                success_rate=Avg(
-                    Case(
-                        When(success=True, then=1),
-                        default=0,
-                        output_field=IntegerField()
-                    ),
-                    output_field=FloatField()
-                ) * 100,
-                avg_complexity=Avg('complexity_score')
-            )
-            .order_by('-count')
+        # Tier analysis
+        tier_analysis = merge_tier_rows(
+            User.objects.values('tier').annotate(user_count=Count('phone_number')).order_by(),
+            window['tier_stats'],
+            {'task_count': 0, 'avg_processing_time': None},
+            'user_count'
         )
         
-        # Peak hour stats - serialize datetime properly
-        peak_hour_stats_raw = Task.objects.filter(created_at__gte=start_date).extra({'hour': "extract(hour from created_at)"}).values('hour').annotate(task_count=Count('id')).order_by('-task_count')[:5]
-        peak_hour_stats = list(peak_hour_stats_raw)
-        
         # Error breakdown
         error_breakdown = list(
             ErrorLog.objects.filter(timestamp__gte=start_date)
@@ -620,49 +923,53 @@ def api_analytics_detailed(request):
         analytics_data = {
             'daily_stats': daily_stats,
             'tier_analysis': tier_analysis,
-            'category_stats': category_stats,
+            'category_stats': window['category_stats'],
             'user_analytics': get_user_analytics_data(days),
             'task_analytics': get_task_analytics_data(days),
             'performance_metrics': {
-                'avg_response_time': Task.objects.filter(
-                    created_at__gte=start_date
-                ).aggregate(avg_time=Avg('processing_time'))['avg_time'] or 0,
-                'peak_hour_stats': peak_hour_stats,
+                'avg_response_time': window['avg_response_time'],
+                'peak_hour_stats': window['peak_hour_stats'],
                 'error_breakdown': error_breakdown
             }
         }
         
-        return DateTimeAwareJSONResponse(analytics_data)
+        # Sections are encoded as they are sent rather than as one large string
+        return StreamingHttpResponse(iter_json_object(analytics_data), content_type='application/json')
         
     except Exception as e:
         logger.error(f"Error getting detailed analytics: {e}")
         return DateTimeAwareJSONResponse({'error': 'Failed to fetch detailed analytics'}, status=500)
 
 
-@require_admin_auth
 def api_system_performance(request):
     """API endpoint for system performance metrics"""
     try:
-        hours = int(request.GET.get('hours', 24))
+        hours = query_params(request, hours=HOURS_PARAM)['hours']
         start_time = timezone.now() - timedelta(hours=hours)
         
-        # Performance metrics - serialize datetime properly
-        response_times_raw = Task.objects.filter(created_at__gte=start_time).extra({'hour': "date_trunc('hour', created_at)"}).values('hour').annotate(
+        # Performance metrics
+        response_times_raw = Task.objects.filter(created_at__gte=start_time).annotate(hour=TruncHour('created_at')).values('hour').annotate(
             avg_time=Avg('processing_time'),
             max_time=Max('processing_time'),
             min_time=Min('processing_time'),
             task_count=Count('id')
         ).order_by('hour')
-        response_times = serialize_queryset_datetime(response_times_raw)
+        response_times = list(response_times_raw)
         
-        throughput_raw = Task.objects.filter(created_at__gte=start_time).extra({'hour': "date_trunc('hour', created_at)"}).values('hour').annotate(tasks_per_hour=Count('id')).order_by('hour')
-        throughput = serialize_queryset_datetime(throughput_raw)
+        throughput_raw = Task.objects.filter(created_at__gte=start_time).annotate(hour=TruncHour('created_at')).values('hour').annotate(tasks_per_hour=Count('id')).order_by('hour')
+        throughput = list(throughput_raw)
         
-        success_rate_trend_raw = Task.objects.filter(created_at__gte=start_time).extra({'hour': "date_trunc('hour', created_at)"}).values('hour').annotate(
+        success_rate_trend_raw = Task.objects.filter(created_at__gte=start_time).annotate(hour=TruncHour('created_at')).values('hour').annotate(
             total_tasks=Count('id'),
             successful_tasks=Count('id', filter=Q(success=True))
         ).order_by('hour')
-        success_rate_trend = serialize_queryset_datetime(success_rate_trend_raw)
+        success_rate_trend = list(success_rate_trend_raw)
+        
+        # Distinct active users from the Redis HyperLogLogs; a database
+        # count is used when Redis is unavailable or the window is not yet tracked
+        active_users = count_active_users(start_time)
+        if active_users is None:
+            active_users = User.objects.filter(last_active__gte=start_time).count()
         
         performance_data = {
             'response_times': response_times,
@@ -673,9 +980,7 @@ def api_system_performance(request):
                 'avg_processing_time': Task.objects.filter(
                     created_at__gte=start_time
                 ).aggregate(avg_time=Avg('processing_time'))['avg_time'] or 0,
-                'peak_concurrent_users': User.objects.filter(
-                    last_active__gte=start_time
-                ).count()
+                'peak_concurrent_users': active_users
             }
         }
         
@@ -686,29 +991,30 @@ def api_system_performance(request):
         return DateTimeAwareJSONResponse({'error': 'Failed to fetch system performance'}, status=500)
 
 
-@require_admin_auth
 def api_system_errors(request):
     """API endpoint for system error information"""
     try:
-        hours = int(request.GET.get('hours', 24))
+        hours = query_params(request, hours=HOURS_PARAM)['hours']
         start_time = timezone.now() - timedelta(hours=hours)
         
-        # Recent errors - serialize datetime properly
-        recent_errors_raw = ErrorLog.objects.filter(timestamp__gte=start_time).values(
-            'id', 'error_type', 'error_message', 'timestamp',
-            'user_phone', 'task__id', 'resolved'
+        errors = ErrorLog.objects.filter(timestamp__gte=start_time)
+        
+        # Recent errors
+        recent_errors_raw = errors.values(
+            'id', 'error_type', 'timestamp', 'user_phone', 'task__id', 'resolved',
+            error_preview=ERROR_PREVIEW
         ).order_by('-timestamp')[:50]
-        recent_errors = serialize_queryset_datetime(recent_errors_raw)
+        recent_errors = list(recent_errors_raw)
         
-        # Error trends - serialize datetime properly
-        error_trends_raw = ErrorLog.objects.filter(timestamp__gte=start_time).extra({'hour': "date_trunc('hour', timestamp)"}).values('hour').annotate(error_count=Count('id')).order_by('hour')
-        error_trends = serialize_queryset_datetime(error_trends_raw)
+        # Error trends
+        error_trends_raw = errors.annotate(hour=TruncHour('timestamp')).values('hour').annotate(error_count=Count('id')).order_by('hour')
+        error_trends = list(error_trends_raw)
         
-        # Error by type
+        # Error by type; the period totals are summed from these rows
+        # rather than counted again
         error_by_type = list(
-            ErrorLog.objects.filter(timestamp__gte=start_time)
-            .values('error_type')
-            .annotate(count=Count('id'))
+            errors.values('error_type')
+            .annotate(count=Count('id'), unresolved=Count('id', filter=Q(resolved=False)))
             .order_by('-count')
         )
         
@@ -716,13 +1022,8 @@ def api_system_errors(request):
             'recent_errors': recent_errors,
             'error_trends': error_trends,
             'error_by_type': error_by_type,
-            'unresolved_errors': ErrorLog.objects.filter(
-                timestamp__gte=start_time,
-                resolved=False
-            ).count(),
-            'total_errors_period': ErrorLog.objects.filter(
-                timestamp__gte=start_time
-            ).count()
+            'unresolved_errors': sum(row['unresolved'] for row in error_by_type),
+            'total_errors_period': sum(row['count'] for row in error_by_type)
         }
         
         return DateTimeAwareJSONResponse(error_data)
@@ -732,41 +1033,44 @@ def api_system_errors(request):
         return DateTimeAwareJSONResponse({'error': 'Failed to fetch system errors'}, status=500)
 
 
-@require_admin_auth
+@lru_cache(maxsize=1)
+def get_system_config_data():
+    """Configuration summary for the system page; settings do not change at runtime, so it is built once"""
+    return {
+        'database': {
+            'engine': settings.DATABASES['default']['ENGINE'],
+            'name': settings.DATABASES['default']['NAME'],
+            'host': settings.DATABASES['default']['HOST'],
+            'port': settings.DATABASES['default']['PORT']
+        },
+        'external_services': {
+            'twilio_configured': bool(settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN),
+            'openai_configured': bool(settings.OPENAI_API_KEY),
+            'redis_url': settings.REDIS_URL
+        },
+        'rate_limits': {
+            'free': settings.RATE_LIMIT_FREE,
+            'premium': settings.RATE_LIMIT_PREMIUM,
+            'enterprise': settings.RATE_LIMIT_ENTERPRISE
+        },
+        'application': {
+            'debug': settings.DEBUG,
+            'allowed_hosts': settings.ALLOWED_HOSTS,
+            'time_zone': settings.TIME_ZONE,
+            'language_code': settings.LANGUAGE_CODE
+        },
+        'features': {
+            'cors_enabled': 'corsheaders' in settings.INSTALLED_APPS,
+            'rest_framework': 'rest_framework' in settings.INSTALLED_APPS,
+            'admin_dashboard': 'admin_dashboard' in settings.INSTALLED_APPS
+        }
+    }
+
+
 def api_system_config(request):
     """API endpoint for system configuration"""
     try:
-        config_data = {
-            'database': {
-                'engine': settings.DATABASES['default']['ENGINE'],
-                'name': settings.DATABASES['default']['NAME'],
-                'host': settings.DATABASES['default']['HOST'],
-                'port': settings.DATABASES['default']['PORT']
-            },
-            'external_services': {
-                'twilio_configured': bool(settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN),
-                'openai_configured': bool(settings.OPENAI_API_KEY),
-                'redis_url': settings.REDIS_URL
-            },
-            'rate_limits': {
-                'free': settings.RATE_LIMIT_FREE,
-                'premium': settings.RATE_LIMIT_PREMIUM,
-                'enterprise': settings.RATE_LIMIT_ENTERPRISE
-            },
-            'application': {
-                'debug': settings.DEBUG,
-                'allowed_hosts': settings.ALLOWED_HOSTS,
-                'time_zone': settings.TIME_ZONE,
-                'language_code': settings.LANGUAGE_CODE
-            },
-            'features': {
-                'cors_enabled': 'corsheaders' in settings.INSTALLED_APPS,
-                'rest_framework': 'rest_framework' in settings.INSTALLED_APPS,
-                'admin_dashboard': 'admin_dashboard' in settings.INSTALLED_APPS
-            }
-        }
-        
-        return DateTimeAwareJSONResponse(config_data)
+        return DateTimeAwareJSONResponse(get_system_config_data())
         
     except Exception as e:
         logger.error(f"Error getting system config: {e}")
@@ -774,68 +1078,115 @@ def api_system_config(request):
 
 
 # Missing API endpoints for user management
-@require_admin_auth
+USER_DETAIL_FIELDS = (
+    'phone_number', 'tier', 'email', 'full_name', 'created_at', 'last_active',
+    'total_requests', 'monthly_requests'
+)
+RECENT_TASK_FIELDS = ('id', 'category', 'complexity_score', 'success', 'processing_time', 'created_at')
+
+
+# One round trip on PostgreSQL: the user row is joined to its ten most recent
+# tasks, and the per-category statistics ride along as a jsonb scalar (they
+# hold no dates, so every datetime still goes through the response encoder)
+USER_DETAIL_SQL = f"""
+    SELECT
+        {', '.join(f'u.{field}' for field in USER_DETAIL_FIELDS)},
+        {', '.join(f't.{field} AS task_{field}' for field in RECENT_TASK_FIELDS)},
+        (
+            SELECT COALESCE(jsonb_agg(stats ORDER BY stats.count DESC), '[]'::jsonb)
+            FROM (
+                SELECT
+                    category,
+                    COUNT(*) AS count,
+                    COUNT(*) FILTER (WHERE success) * 100.0 / COUNT(*) AS success_rate,
+                    AVG(processing_time) AS avg_time
+                FROM tasks
+                WHERE user_phone_id = u.phone_number
+                GROUP BY category
+            ) stats
+        ) AS task_statistics
+    FROM users u
+    LEFT JOIN LATERAL (
+        SELECT {', '.join(RECENT_TASK_FIELDS)}
+        FROM tasks
+        WHERE user_phone_id = u.phone_number
+        ORDER BY created_at DESC
+        LIMIT 10
+    ) t ON true
+    WHERE u.phone_number = %s
+    ORDER BY t.created_at DESC
+"""
+
+
+def get_user_detail_data(phone_number):
+    """User profile, per-category task statistics and the ten most recent tasks
+
+    Returns None for unknown users. PostgreSQL gets everything from a single
+    query; other databases fall back to the equivalent ORM queries.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(USER_DETAIL_SQL, [phone_number])
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        if not rows:
+            return None
+        first = rows[0]
+        return {
+            'user_info': {field: first[field] for field in USER_DETAIL_FIELDS},
+            'task_statistics': first['task_statistics'],
+            'recent_tasks': [
+                {field: row[f'task_{field}'] for field in RECENT_TASK_FIELDS}
+                for row in rows if row['task_id'] is not None
+            ]
+        }
+    
+    # Three round trips, each its own autocommit transaction (SERIALIZABLE only
+    # because settings.py sets default_transaction_isolation), so the statistics
+    # and recent tasks may straddle a concurrent insert; fine for a dashboard
+    user_info = User.objects.filter(phone_number=phone_number).values(*USER_DETAIL_FIELDS).first()
+    if user_info is None:
+        return None
+    task_stats = with_success_rate(
+        Task.objects.filter(user_phone_id=phone_number)
+        .values('category')
+        .annotate(
+            count=Count('id'),
+            successful=Count('id', filter=Q(success=True)),
+            avg_time=Avg('processing_time')
+        )
+        .order_by('-count')
+    )
+    recent_tasks = list(
+        Task.objects.filter(user_phone_id=phone_number)
+        .order_by('-created_at')
+        .values(*RECENT_TASK_FIELDS)[:10]
+    )
+    return {
+        'user_info': user_info,
+        'task_statistics': task_stats,
+        'recent_tasks': recent_tasks
+    }
+
+
 def api_user_details(request, phone_number):
     """API endpoint for individual user details"""
     try:
-        user = User.objects.get(phone_number=phone_number)
-        
-        # Get user's task statistics
-        task_stats = list(
-            Task.objects.filter(user_phone=user)
-            .values('category')
-            .annotate(
-                count=Count('id'),
-                success_rate=Avg(
-                    Case(
-                        When(success=True, then=1),
-                        default=0,
-                        output_field=IntegerField()
-                    ),
-                    output_field=FloatField()
-                ) * 100,
-                avg_time=Avg('processing_time')
-            )
-            .order_by('-count')
-        )
-        
-        # Get recent tasks - serialize datetime properly
-        recent_tasks_raw = Task.objects.filter(user_phone=user).order_by('-created_at')[:10].values(
-            'id', 'category', 'complexity_score', 'success',
-            'processing_time', 'created_at'
-        )
-        recent_tasks = serialize_queryset_datetime(recent_tasks_raw)
-        
-        user_data = {
-            'user_info': {
-                'phone_number': user.phone_number,
-                'tier': user.tier,
-                'email': user.email,
-                'full_name': user.full_name,
-                'created_at': user.created_at.isoformat() if user.created_at else None,
-                'last_active': user.last_active.isoformat() if user.last_active else None,
-                'total_requests': user.total_requests,
-                'monthly_requests': user.monthly_requests,
-            },
-            'task_statistics': task_stats,
-            'recent_tasks': recent_tasks
-        }
+        user_data = get_user_detail_data(phone_number)
+        if user_data is None:
+            return DateTimeAwareJSONResponse({'error': 'User not found'}, status=404)
         
         return DateTimeAwareJSONResponse(user_data)
         
-    except User.DoesNotExist:
-        return DateTimeAwareJSONResponse({'error': 'User not found'}, status=404)
     except Exception as e:
         logger.error(f"Error getting user details: {e}")
         return DateTimeAwareJSONResponse({'error': 'Failed to fetch user details'}, status=500)
 
 
-@require_admin_auth  
 @require_http_methods(["POST"])
 def api_users_broadcast(request):
     """API endpoint for broadcasting messages to all users"""
     try:
-        import json
         data = json.loads(request.body)
         message = data.get('message', '').strip()
         
@@ -843,8 +1194,8 @@ def api_users_broadcast(request):
             return DateTimeAwareJSONResponse({'error': 'Message is required'}, status=400)
             
         # Here you would implement the actual SMS broadcasting
-        # For now, just return success
-        user_count = User.objects.count()
+        # For now, just return success; the count is only reported back
+        user_count = fast_count(User)
         
         logger.info(f"Broadcast message sent to {user_count} users: {message[:50]}...")
         
@@ -859,12 +1210,10 @@ def api_users_broadcast(request):
         return DateTimeAwareJSONResponse({'error': 'Failed to send broadcast message'}, status=500)
 
 
-@require_admin_auth
 @require_http_methods(["POST"])
 def api_users_message(request):
     """API endpoint for sending message to individual user"""
     try:
-        import json
         data = json.loads(request.body)
         phone_number = data.get('phone_number', '').strip()
         message = data.get('message', '').strip()
@@ -893,12 +1242,26 @@ def api_users_message(request):
         return DateTimeAwareJSONResponse({'error': 'Failed to send message'}, status=500)
 
 
-@require_admin_auth
+def invalidate_tier_caches(*tiers):
+    """Drop cached data a change to users of `tiers` makes stale
+
+    That is the users-list totals filtered by those tiers and the per-tier
+    activity in get_user_analytics_data, for every window DAYS_PARAM allows.
+    Searched, tier-filtered totals are left to expire on their own.
+    """
+    low, high = DAYS_PARAM[2], DAYS_PARAM[3]
+    keys = [get_user_analytics_data.cache_key(days) for days in range(low, high + 1)]
+    keys += [users_count_cache_key('', tier) for tier in tiers]
+    try:
+        cache.delete_many(keys)
+    except RedisError as e:
+        logger.warning(f"Could not invalidate tier caches: {e}")
+
+
 @require_http_methods(["POST"])
 def api_users_tier(request):
     """API endpoint for updating user tier"""
     try:
-        import json
         data = json.loads(request.body)
         phone_number = data.get('phone_number', '').strip()
         new_tier = data.get('tier', '').strip()
@@ -916,6 +1279,8 @@ def api_users_tier(request):
             user.tier = new_tier
             user.save()
             
+            invalidate_tier_caches(old_tier, new_tier)
+            
             logger.info(f"User {phone_number} tier updated from {old_tier} to {new_tier}")
             
             return DateTimeAwareJSONResponse({
@@ -933,60 +1298,50 @@ def api_users_tier(request):
         return DateTimeAwareJSONResponse({'error': 'Failed to update user tier'}, status=500)
 
 
-@require_admin_auth
 def api_analytics_export(request):
     """API endpoint for exporting analytics data as CSV"""
     try:
-        import csv
-        import io
-        from django.http import HttpResponse
-        
         start_date = request.GET.get('start_date')
         end_date = request.GET.get('end_date')
         
         if not start_date or not end_date:
             return DateTimeAwareJSONResponse({'error': 'start_date and end_date are required'}, status=400)
             
-        # Create CSV data
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        writer.writerow([
-            'Date', 'Total Tasks', 'Successful Tasks', 'Success Rate', 
-            'Avg Processing Time', 'Category', 'User Count'
-        ])
-        
         # Get analytics data
-        from datetime import datetime
         start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
         end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
         
         daily_stats = Task.objects.filter(
-            created_at__gte=start_dt,
-            created_at__lte=end_dt
-        ).extra({'date': "date(created_at)"}).values('date').annotate(
+            created_at__range=(start_dt, end_dt)
+        ).annotate(date=TruncDate('created_at')).values('date').annotate(
             total_tasks=Count('id'),
             successful_tasks=Count('id', filter=Q(success=True)),
-            avg_processing_time=Avg('processing_time')
+            avg_processing_time=Avg('processing_time'),
+            unique_users=Count('user_phone', distinct=True)
         ).order_by('date')
         
-        for stat in daily_stats:
-            success_rate = (stat['successful_tasks'] / stat['total_tasks'] * 100) if stat['total_tasks'] > 0 else 0
-            writer.writerow([
-                stat['date'],
-                stat['total_tasks'],
-                stat['successful_tasks'],
-                f"{success_rate:.2f}%",
-                f"{stat['avg_processing_time']:.2f}s" if stat['avg_processing_time'] else "0s",
-                "All",
-                User.objects.filter(
-                    tasks__created_at__date=stat['date']
-                ).distinct().count()
-            ])
+        # Rows are written as they are fetched, so the download starts
+        # immediately and only one row is held in memory
+        writer = csv.writer(Echo())
         
-        # Create HTTP response
-        response = HttpResponse(output.getvalue(), content_type='text/csv')
+        def csv_rows():
+            yield writer.writerow([
+                'Date', 'Total Tasks', 'Successful Tasks', 'Success Rate', 
+                'Avg Processing Time', 'Category', 'User Count'
+            ])
+            for stat in daily_stats.iterator(chunk_size=200):
+                success_rate = (stat['successful_tasks'] / stat['total_tasks'] * 100) if stat['total_tasks'] > 0 else 0
+                yield writer.writerow([
+                    stat['date'],
+                    stat['total_tasks'],
+                    stat['successful_tasks'],
+                    f"{success_rate:.2f}%",
+                    f"{stat['avg_processing_time']:.2f}s" if stat['avg_processing_time'] else "0s",
+                    "All",
+                    stat['unique_users']
+                ])
+        
+        response = StreamingHttpResponse(csv_rows(), content_type='text/csv')
         response['Content-Disposition'] = f'attachment; filename="analytics_{start_date}_to_{end_date}.csv"'
         
         return response
@@ -996,48 +1351,48 @@ def api_analytics_export(request):
         return DateTimeAwareJSONResponse({'error': 'Failed to export analytics data'}, status=500)
 
 
-@require_admin_auth
+@local_ttl_cache(HEALTH_CACHE_SECONDS)
+@cached_helper(HEALTH_CACHE_SECONDS)
+def get_health_probe_data():
+    """Health figures for the polled system-health endpoint"""
+    yesterday = timezone.now() - timedelta(days=1)
+    
+    # The slow-task count doubles as the database connectivity check; a
+    # failure propagates so the view reports it and nothing is cached
+    slow_tasks_count = Task.objects.filter(
+        created_at__gte=yesterday,
+        processing_time__gt=30
+    ).count()
+    
+    # Get recent error statistics
+    error_stats = list(
+        ErrorLog.objects.filter(timestamp__gte=yesterday)
+        .values('error_type')
+        .annotate(count=Count('id'))
+        .order_by('-count')[:5]
+    )
+    
+    # Get recent errors for display
+    recent_errors_raw = ErrorLog.objects.filter(timestamp__gte=yesterday).order_by('-timestamp').values('error_type', 'timestamp', 'user_phone', error_preview=ERROR_PREVIEW)[:5]
+    recent_errors = list(recent_errors_raw)
+    
+    return {
+        'database_health': {
+            'status': 'healthy',
+            'connected': True
+        },
+        'slow_tasks_count': slow_tasks_count,
+        'error_stats': error_stats,
+        'recent_errors': recent_errors,
+        'timestamp': timezone.now().isoformat(),
+        'overall_status': 'healthy' if slow_tasks_count < 10 and len(error_stats) < 5 else 'warning'
+    }
+
+
 def api_system_health(request):
     """API endpoint for system health data in the format expected by JavaScript"""
     try:
-        yesterday = timezone.now() - timedelta(days=1)
-        
-        # Database health check
-        try:
-            total_tasks = Task.objects.count()
-            database_healthy = True
-        except Exception:
-            database_healthy = False
-            
-        # Check for slow tasks (processing time > 30 seconds)
-        slow_tasks_count = Task.objects.filter(
-            created_at__gte=yesterday,
-            processing_time__gt=30
-        ).count()
-        
-        # Get recent error statistics
-        error_stats = list(
-            ErrorLog.objects.filter(timestamp__gte=yesterday)
-            .values('error_type')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:5]
-        )
-        
-        # Get recent errors for display - serialize datetime properly
-        recent_errors_raw = ErrorLog.objects.filter(timestamp__gte=yesterday).order_by('-timestamp')[:5].values('error_type', 'error_message', 'timestamp', 'user_phone')
-        recent_errors = serialize_queryset_datetime(recent_errors_raw)
-        
-        health_data = {
-            'database_health': {
-                'status': 'healthy' if database_healthy else 'error',
-                'connected': database_healthy
-            },
-            'slow_tasks_count': slow_tasks_count,
-            'error_stats': error_stats,
-            'recent_errors': recent_errors,
-            'timestamp': timezone.now().isoformat(),
-            'overall_status': 'healthy' if database_healthy and slow_tasks_count < 10 and len(error_stats) < 5 else 'warning'
-        }
+        health_data = get_health_probe_data()
         
         return DateTimeAwareJSONResponse(health_data)
         
@@ -39,6 +39,12 @@ except ImportError as e:
     admin_bp = None
     ADMIN_AVAILABLE = False
 
+# Brotli/gzip for the larger admin JSON payloads when Flask-Compress is installed
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 # Temporarily disable advanced components for testing
 try:
     from task_router import TaskRouter
@@ -66,6 +72,15 @@ except ImportError as e:
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 
+if Compress is not None:
+    app.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_MIN_SIZE=500,
+        # Leave streamed responses alone so the admin SSE feed is flushed per event
+        COMPRESS_STREAMS=False
+    )
+    Compress(app)
+
 # Register admin blueprint
 if admin_bp:
     app.register_blueprint(admin_bp)
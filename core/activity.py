@@ -0,0 +1,93 @@
+"""
+Approximate active-user tracking with Redis HyperLogLogs
+
+Every user save that changes ``last_active`` adds the user to an hourly
+HyperLogLog (``PFADD``); distinct users over a window are then one
+``PFCOUNT`` across the hourly keys, in constant memory per hour.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+try:
+    import redis
+    from redis import RedisError
+except ImportError:  # optional; callers fall back to a database count
+    redis = None
+    RedisError = ()  # matches nothing when redis is not installed
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_USERS_KEY_PREFIX = 'active_users:'
+ACTIVE_USERS_RETENTION = timedelta(days=31)
+# Unix time of the first recorded activity; windows starting earlier are not covered
+ACTIVE_USERS_TRACKED_SINCE_KEY = 'active_users:tracked_since'
+
+_client = None
+
+
+def get_redis_client():
+    """Return a shared Redis client for REDIS_URL, or None if redis is unavailable"""
+    global _client
+    if _client is None and redis is not None and getattr(settings, 'REDIS_URL', None):
+        # Short timeouts: these calls sit on the request path (User.save
+        # signal, dashboard views), so a slow Redis must not stall them
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+    return _client
+
+
+def _hour_key(moment):
+    return f"{ACTIVE_USERS_KEY_PREFIX}{moment:%Y%m%d%H}"
+
+
+def record_active_user(phone_number, when=None):
+    """Add `phone_number` to the active-users HyperLogLog for the hour of `when`"""
+    client = get_redis_client()
+    if client is None:
+        return
+    key = _hour_key(when or timezone.now())
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.pfadd(key, phone_number)
+        pipe.expire(key, ACTIVE_USERS_RETENTION)
+        # Kept alive by activity; after a longer gap it lapses and restarts here
+        pipe.set(ACTIVE_USERS_TRACKED_SINCE_KEY, timezone.now().timestamp(), nx=True)
+        pipe.expire(ACTIVE_USERS_TRACKED_SINCE_KEY, ACTIVE_USERS_RETENTION)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not record active user: {e}")
+
+
+def count_active_users(since):
+    """Approximate number of distinct users active since `since`
+
+    Returns None, so the caller counts from the database instead, when Redis
+    is unavailable or the window is not covered by the HyperLogLogs: tracking
+    started after `since`, or `since` is older than the hourly keys are kept.
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+    now = timezone.now()
+    if since < now - ACTIVE_USERS_RETENTION:
+        return None
+    moment = since.replace(minute=0, second=0, microsecond=0)
+    keys = []
+    while moment <= now:
+        keys.append(_hour_key(moment))
+        moment += timedelta(hours=1)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.get(ACTIVE_USERS_TRACKED_SINCE_KEY)
+        pipe.pfcount(*keys)
+        tracked_since, count = pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not count active users: {e}")
+        return None
+    if tracked_since is None or float(tracked_since) > since.timestamp():
+        return None
+    return count
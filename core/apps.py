@@ -8,4 +8,4 @@ class CoreConfig(AppConfig):
     
     def ready(self):
         """Initialize the app when Django starts"""
-        pass 
\ No newline at end of file
+        from . import signals  # noqa: F401  (registers signal receivers) 
\ No newline at end of file
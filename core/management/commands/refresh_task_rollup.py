@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+import time
+
+
+class Command(BaseCommand):
+    help = 'Refresh the task_daily_rollup materialized view used by dashboard analytics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and refresh every N seconds (default: refresh once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options.get('interval', 0)
+
+        while True:
+            started = time.monotonic()
+            try:
+                # CONCURRENTLY keeps the view readable while it is rebuilt; it relies
+                # on the unique (day, category) index
+                with connection.cursor() as cursor:
+                    cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY task_daily_rollup')
+            except DatabaseError as e:
+                if interval <= 0:
+                    raise CommandError(f'Failed to refresh task_daily_rollup: {e}')
+                # Keep the loop alive through transient errors; drop the broken
+                # connection so the next attempt opens a fresh one
+                self.stderr.write(self.style.ERROR(f'Failed to refresh task_daily_rollup: {e}'))
+                connection.close()
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Refreshed task_daily_rollup in {time.monotonic() - started:.2f}s')
+                )
+
+            if interval <= 0:
+                return
+            time.sleep(interval)
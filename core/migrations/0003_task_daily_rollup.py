@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+CREATE_ROLLUP_SQL = """
+CREATE MATERIALIZED VIEW task_daily_rollup AS
+SELECT (created_at AT TIME ZONE 'UTC')::date || '/' || category AS id,
+       (created_at AT TIME ZONE 'UTC')::date AS day,
+       category,
+       COUNT(*) AS total,
+       COUNT(*) FILTER (WHERE success) AS successful,
+       SUM(processing_time) AS processing_time_sum,
+       COUNT(processing_time) AS processing_time_count
+FROM tasks
+GROUP BY 2, 3;
+CREATE UNIQUE INDEX task_daily_rollup_day_category ON task_daily_rollup (day, category);
+CREATE UNIQUE INDEX task_daily_rollup_id ON task_daily_rollup (id);
+"""
+
+DROP_ROLLUP_SQL = "DROP MATERIALIZED VIEW IF EXISTS task_daily_rollup;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_dashboard_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_ROLLUP_SQL, DROP_ROLLUP_SQL),
+        migrations.CreateModel(
+            name='TaskDailyRollup',
+            fields=[
+                ('id', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('category', models.CharField(max_length=50)),
+                ('total', models.IntegerField()),
+                ('successful', models.IntegerField()),
+                ('processing_time_sum', models.FloatField(null=True)),
+                ('processing_time_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'task_daily_rollup',
+                'managed': False,
+            },
+        ),
+    ]
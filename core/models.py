@@ -76,6 +76,11 @@ class User(models.Model):
     class Meta:
         db_table = 'users'
         ordering = ['-last_active']
+        indexes = [
+            models.Index(fields=['-last_active', 'phone_number'], name='users_last_active_idx'),
+            models.Index(fields=['tier', '-last_active'], name='users_tier_active_idx'),
+            models.Index(fields=['-created_at'], name='users_created_at_idx'),
+        ]
         
     def __str__(self):
         return f"{self.phone_number} ({self.tier})"
@@ -173,6 +178,12 @@ class Task(models.Model):
             models.Index(fields=['user_phone', '-created_at']),
             models.Index(fields=['category', '-created_at']),
             models.Index(fields=['success', '-created_at']),
+            models.Index(fields=['-created_at'], name='tasks_created_at_idx'),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(success=False),
+                name='tasks_failed_created_at_idx'
+            ),
         ]
     
     def __str__(self):
@@ -252,6 +263,7 @@ class ErrorLog(models.Model):
             models.Index(fields=['error_type', '-timestamp']),
             models.Index(fields=['user_phone', '-timestamp']),
             models.Index(fields=['resolved', '-timestamp']),
+            models.Index(fields=['-timestamp'], name='error_logs_timestamp_idx'),
         ]
     
     def __str__(self):
@@ -267,4 +279,28 @@ class ErrorLog(models.Model):
             error_message=error_message,
             stack_trace=stack_trace,
             metadata=metadata
-        ) 
\ No newline at end of file
+        )
+
+
+class TaskDailyRollup(models.Model):
+    """Per-day, per-category task totals read from the task_daily_rollup materialized view
+
+    The view is refreshed by ``manage.py refresh_task_rollup``; rows lag live
+    tasks by at most the refresh interval. ``id`` is ``"<day>/<category>"``,
+    since a day has one row per category.
+    """
+    
+    id = models.CharField(max_length=64, primary_key=True)
+    day = models.DateField()
+    category = models.CharField(max_length=50)
+    total = models.IntegerField()
+    successful = models.IntegerField()
+    processing_time_sum = models.FloatField(null=True)
+    processing_time_count = models.IntegerField()
+    
+    class Meta:
+        managed = False
+        db_table = 'task_daily_rollup'
+    
+    def __str__(self):
+        return f"{self.day} {self.category}: {self.total} tasks"
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from .activity import record_active_user
+from .models import User
+
+
+@receiver(post_init, sender=User)
+def remember_last_active(sender, instance, **kwargs):
+    """Note the loaded last_active so post_save can tell whether it changed"""
+    # Read from __dict__ so a deferred last_active is not fetched per instance
+    instance._tracked_last_active = instance.__dict__.get('last_active')
+
+
+@receiver(post_save, sender=User)
+def track_user_activity(sender, instance, created=False, update_fields=None, **kwargs):
+    """Feed saves that change last_active into the active-users HyperLogLog"""
+    if update_fields is not None and 'last_active' not in update_fields:
+        return
+    # A full save() (e.g. a tier change) rewrites an unchanged last_active;
+    # recording it again would count the user in that old hour
+    if not created and instance.last_active == getattr(instance, '_tracked_last_active', None):
+        return
+    record_active_user(instance.phone_number, instance.last_active)
+    instance._tracked_last_active = instance.last_active
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase
+
+from . import activity
+from .signals import remember_last_active, track_user_activity
+
+
+def fake_client(*results):
+    """Redis client whose pipeline().execute() returns `results`"""
+    client = mock.Mock()
+    client.pipeline.return_value.execute.return_value = list(results)
+    return client
+
+
+class CountActiveUsersTests(SimpleTestCase):
+    now = datetime(2026, 1, 2, 12, 30, tzinfo=timezone.utc)
+    since = now - timedelta(hours=2)
+
+    def setUp(self):
+        patcher = mock.patch('core.activity.timezone.now', return_value=self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def count(self, client, since):
+        with mock.patch('core.activity.get_redis_client', return_value=client):
+            return activity.count_active_users(since)
+
+    def tracked_since(self, moment):
+        return str(moment.timestamp()).encode()
+
+    def test_none_without_redis(self):
+        self.assertIsNone(self.count(None, self.since))
+
+    def test_counts_across_hourly_keys(self):
+        client = fake_client(self.tracked_since(self.since - timedelta(days=1)), 42)
+
+        self.assertEqual(self.count(client, self.since), 42)
+
+        pipe = client.pipeline.return_value
+        pipe.get.assert_called_once_with(activity.ACTIVE_USERS_TRACKED_SINCE_KEY)
+        pipe.pfcount.assert_called_once_with(
+            'active_users:2026010210', 'active_users:2026010211', 'active_users:2026010212'
+        )
+
+    def test_zero_is_a_real_count_once_tracked(self):
+        client = fake_client(self.tracked_since(self.since - timedelta(days=1)), 0)
+
+        self.assertEqual(self.count(client, self.since), 0)
+
+    def test_none_until_window_is_tracked(self):
+        self.assertIsNone(self.count(fake_client(None, 42), self.since))
+        self.assertIsNone(self.count(fake_client(self.tracked_since(self.since + timedelta(minutes=5)), 42),
+                                     self.since))
+
+    def test_none_past_retention(self):
+        client = fake_client(self.tracked_since(self.now - timedelta(days=90)), 42)
+
+        self.assertIsNone(self.count(client, self.now - timedelta(days=60)))
+        client.pipeline.assert_not_called()
+
+    @skipIf(activity.redis is None, "redis is not installed")
+    def test_none_on_redis_error(self):
+        client = mock.Mock()
+        client.pipeline.return_value.execute.side_effect = activity.RedisError('timeout')
+
+        self.assertIsNone(self.count(client, self.since))
+
+
+class TrackUserActivityTests(SimpleTestCase):
+    last_active = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+    def loaded_user(self):
+        user = SimpleNamespace(phone_number='+15551234567', last_active=self.last_active)
+        remember_last_active(sender=None, instance=user)
+        return user
+
+    def test_records_new_users(self):
+        with mock.patch('core.signals.record_active_user') as record:
+            track_user_activity(sender=None, instance=self.loaded_user(), created=True)
+
+        record.assert_called_once_with('+15551234567', self.last_active)
+
+    def test_records_changed_last_active(self):
+        user = self.loaded_user()
+        user.last_active = self.last_active + timedelta(hours=3)
+
+        with mock.patch('core.signals.record_active_user') as record:
+            track_user_activity(sender=None, instance=user, update_fields={'last_active'})
+            track_user_activity(sender=None, instance=user, update_fields={'last_active'})
+
+        record.assert_called_once_with('+15551234567', user.last_active)
+
+    def test_ignores_full_save_with_unchanged_last_active(self):
+        with mock.patch('core.signals.record_active_user') as record:
+            track_user_activity(sender=None, instance=self.loaded_user())
+
+        record.assert_not_called()
+
+    def test_ignores_saves_without_last_active(self):
+        user = self.loaded_user()
+        user.last_active = self.last_active + timedelta(hours=3)
+
+        with mock.patch('core.signals.record_active_user') as record:
+            track_user_activity(sender=None, instance=user, update_fields={'tier'})
+
+        record.assert_not_called()
@@ -4,7 +4,12 @@ Provides robust database management for the Enhanced SMS-to-Cursor AI Agent
 """
 
 import os
+import re
 import logging
+import hashlib
+import threading
+import time
+import uuid
 from contextlib import contextmanager
 from typing import Dict, Any, List, Optional
 from urllib.parse import urlparse
@@ -17,9 +22,67 @@ try:
     import psycopg2
     import psycopg2.extras
     import psycopg2.pool
+    from psycopg2.extensions import TransactionRollbackError, connection as PGConnection
 except ImportError:
     raise RuntimeError("PostgreSQL support requires psycopg2. Install with: pip install psycopg2-binary")
 
+# Serialization failures and deadlocks roll the whole transaction back, so
+# the statement can be replayed safely after a short backoff
+QUERY_RETRIES = 3
+QUERY_RETRY_BACKOFF = 0.05  # seconds, doubled on each attempt
+
+# Server-side prepared statements belong to one backend session; turn them
+# off when connecting through a transaction-mode pooler such as pgbouncer
+USE_PREPARED_STATEMENTS = os.environ.get('DB_PREPARED_STATEMENTS', 'true').lower() == 'true'
+
+# Default pool size: the usual (cores * 2) + 1 sizing, but never fewer than the
+# 10 connections the admin dashboard's panel loaders and refreshers rely on
+DEFAULT_POOL_SIZE = max(10, (os.cpu_count() or 1) * 2 + 1)
+# ThreadedConnectionPool opens `minconn` connections eagerly in every process,
+# so the minimum stays small and only the maximum scales with the host
+DEFAULT_MIN_POOL_SIZE = 2
+
+# One-off schema changes, applied once in version order and recorded in db_version
+SCHEMA_MIGRATIONS = [
+    (2, 'Drop plain indexes superseded by covering indexes', [
+        "DROP INDEX IF EXISTS idx_tasks_created_at",
+        "DROP INDEX IF EXISTS idx_error_logs_timestamp",
+    ]),
+]
+# Serializes the migration step across processes starting at the same time
+SCHEMA_MIGRATION_LOCK_ID = 0x61646d10
+
+_PLACEHOLDER_RE = re.compile(r"%\((\w+)\)s|%s|%%")
+
+
+class PreparedStatementConnection(PGConnection):
+    """psycopg2 connection that remembers which statements have been PREPAREd on it"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = {}
+
+
+def _to_prepared_sql(query: str):
+    """Rewrite psycopg2 placeholders as $n parameters for PREPARE.
+    
+    Returns the rewritten SQL and the parameter order: mapping keys for
+    %(name)s placeholders, or None for positional %s ones.
+    """
+    keys = []
+    
+    def substitute(match):
+        if match.group(0) == '%%':
+            return '%'
+        if match.group(1) is None:
+            keys.append(None)
+            return f"${len(keys)}"
+        if match.group(1) not in keys:
+            keys.append(match.group(1))
+        return f"${keys.index(match.group(1)) + 1}"
+    
+    return _PLACEHOLDER_RE.sub(substitute, query), keys
+
 
 class DatabaseManager:
     """
@@ -27,7 +90,8 @@ class DatabaseManager:
     Provides connection management, schema initialization, and health monitoring
     """
     
-    def __init__(self, database_url: str = None, notification_db_url: str = None, pool_size: int = 10):
+    def __init__(self, database_url: str = None, notification_db_url: str = None, pool_size: int = 10,
+                 min_pool_size: int = None):
         """
         Initialize PostgreSQL database manager
         
@@ -35,6 +99,7 @@ class DatabaseManager:
             database_url: PostgreSQL connection URL
             notification_db_url: Notification database URL (defaults to main database)
             pool_size: Connection pool size for better performance
+            min_pool_size: Connections opened at startup and kept idle (defaults to DEFAULT_MIN_POOL_SIZE)
         """
         # Default database URLs
         if not database_url:
@@ -52,7 +117,7 @@ class DatabaseManager:
         self.notification_db_config = self._parse_database_url(notification_db_url)
         
         # Initialize connection pools for better performance
-        self._init_connection_pools(pool_size)
+        self._init_connection_pools(pool_size, min_pool_size)
         
         # Initialize database schemas
         self._init_databases()
@@ -75,28 +140,38 @@ class DatabaseManager:
             'password': parsed.password or 'secure_password_123'
         }
     
-    def _init_connection_pools(self, pool_size: int):
+    def _init_connection_pools(self, pool_size: int, min_pool_size: int = None):
         """Initialize connection pools for better performance"""
+        # psycopg2 closes any connection handed back while `minconn` idle
+        # connections are already pooled, so raise DB_POOL_MIN_SIZE if bursts
+        # of concurrent requests reconnect too often
+        if min_pool_size is None:
+            min_pool_size = DEFAULT_MIN_POOL_SIZE
+        min_pool_size = max(1, min(min_pool_size, pool_size))
+        
         try:
             # Main database connection pool
             self.main_pool = psycopg2.pool.ThreadedConnectionPool(
-                1, pool_size,
+                min_pool_size, pool_size,
                 host=self.main_db_config['host'],
                 port=self.main_db_config['port'],
                 database=self.main_db_config['database'],
                 user=self.main_db_config['username'],
-                password=self.main_db_config['password']
+                password=self.main_db_config['password'],
+                connection_factory=PreparedStatementConnection
             )
             
             # Notification database connection pool (may be same as main)
             if self.notification_db_config != self.main_db_config:
+                notification_pool_size = max(1, pool_size // 2)  # Smaller pool for notifications
                 self.notification_pool = psycopg2.pool.ThreadedConnectionPool(
-                    1, pool_size // 2,  # Smaller pool for notifications
+                    min(min_pool_size, notification_pool_size), notification_pool_size,
                     host=self.notification_db_config['host'],
                     port=self.notification_db_config['port'],
                     database=self.notification_db_config['database'],
                     user=self.notification_db_config['username'],
-                    password=self.notification_db_config['password']
+                    password=self.notification_db_config['password'],
+                    connection_factory=PreparedStatementConnection
                 )
             else:
                 self.notification_pool = self.main_pool
@@ -124,7 +199,8 @@ class DatabaseManager:
             yield conn
         finally:
             if conn:
-                pool.putconn(conn)
+                # Drop connections the server closed instead of handing them out again
+                pool.putconn(conn, close=bool(conn.closed))
     
     @contextmanager
     def get_cursor(self, db_type: str = 'main'):
@@ -141,7 +217,40 @@ class DatabaseManager:
             finally:
                 cursor.close()
     
-    def execute_query(self, query: str, params: tuple = None, db_type: str = 'main', fetch: str = 'all') -> Optional[List[Dict]]:
+    def _retry(self, operation):
+        """Run `operation`, replaying it when PostgreSQL rolls the transaction back"""
+        for attempt in range(QUERY_RETRIES):
+            try:
+                return operation()
+            except TransactionRollbackError as e:
+                if attempt == QUERY_RETRIES - 1:
+                    raise
+                logger.warning(f"Transaction rolled back ({e.pgcode}), retrying: {e}")
+                time.sleep(QUERY_RETRY_BACKOFF * 2 ** attempt)
+    
+    def _execute_prepared(self, cursor, query: str, params=None):
+        """Run `query` through a statement PREPAREd on the cursor's connection, preparing it on first use"""
+        statements = cursor.connection.prepared_statements
+        statement = statements.get(query)
+        if statement is None:
+            sql, keys = _to_prepared_sql(query)
+            name = f"stmt_{hashlib.blake2b(query.encode(), digest_size=8).hexdigest()}"
+            cursor.execute(f"PREPARE {name} AS {sql}")
+            statement = statements[query] = (name, keys)
+        
+        name, keys = statement
+        if isinstance(params, dict):
+            args = [params[key] for key in keys]
+        else:
+            args = list(params or ())
+        
+        if args:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(args))})", args)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+    
+    def execute_query(self, query: str, params: tuple = None, db_type: str = 'main', fetch: str = 'all',
+                      prepared: bool = False) -> Optional[List[Dict]]:
         """
         Execute PostgreSQL query and return results
         
@@ -150,17 +259,52 @@ class DatabaseManager:
             params: Query parameters
             db_type: Database to query ('main' or 'notifications')
             fetch: 'all', 'one', or 'none' for fetchall(), fetchone(), or no fetch
+            prepared: Reuse a per-connection server-side prepared statement so
+                only EXECUTE runs after the first call
         """
-        with self.get_cursor(db_type) as cursor:
-            cursor.execute(query, params or ())
-            
-            if fetch == 'all':
-                return [dict(row) for row in cursor.fetchall()]
-            elif fetch == 'one':
-                row = cursor.fetchone()
-                return dict(row) if row else None
-            else:
-                return None
+        def run():
+            with self.get_cursor(db_type) as cursor:
+                if prepared and USE_PREPARED_STATEMENTS:
+                    self._execute_prepared(cursor, query, params)
+                else:
+                    cursor.execute(query, params or ())
+                
+                # RealDictCursor rows are already dicts; return them without copying
+                if fetch == 'all':
+                    return cursor.fetchall()
+                elif fetch == 'one':
+                    return cursor.fetchone()
+                else:
+                    return None
+        
+        return self._retry(run)
+    
+    def iter_query(self, query: str, params: tuple = None, db_type: str = 'main', batch_size: int = 500):
+        """
+        Execute PostgreSQL query and yield result rows in batches
+        
+        Rows come from a server-side (named) cursor, so only `batch_size` rows
+        are held client-side at a time instead of the whole result set.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters
+            db_type: Database to query ('main' or 'notifications')
+            batch_size: Rows pulled per round-trip, bounding peak memory
+        """
+        with self.get_connection(db_type) as conn:
+            cursor = conn.cursor(name=f"iter_{uuid.uuid4().hex}",
+                                 cursor_factory=psycopg2.extras.RealDictCursor)
+            cursor.itersize = batch_size
+            try:
+                cursor.execute(query, params or ())
+                yield from cursor
+            except BaseException:  # includes GeneratorExit when the caller stops early
+                cursor.close()
+                conn.rollback()
+                raise
+            cursor.close()
+            conn.commit()
     
     def execute_many(self, query: str, params_list: List[tuple], db_type: str = 'main') -> int:
         """
@@ -174,9 +318,38 @@ class DatabaseManager:
         Returns:
             Number of affected rows
         """
-        with self.get_cursor(db_type) as cursor:
-            cursor.executemany(query, params_list)
-            return cursor.rowcount
+        def run():
+            with self.get_cursor(db_type) as cursor:
+                cursor.executemany(query, params_list)
+                return cursor.rowcount
+        
+        return self._retry(run)
+    
+    def execute_values(self, query: str, params_list: List[tuple], template: str = None,
+                       db_type: str = 'main') -> int:
+        """
+        Insert many rows with a single multi-row VALUES statement
+        
+        Args:
+            query: SQL query string with one bare %s where the VALUES list goes
+            params_list: List of parameter tuples, one per row
+            template: Optional per-row template, e.g. "(%s, %s, NOW())"
+            db_type: Database to query
+            
+        Returns:
+            Number of affected rows
+        """
+        if not params_list:
+            return 0
+        
+        def run():
+            with self.get_cursor(db_type) as cursor:
+                psycopg2.extras.execute_values(
+                    cursor, query, params_list, template=template, page_size=len(params_list)
+                )
+                return cursor.rowcount
+        
+        return self._retry(run)
     
     def _init_databases(self):
         """Initialize PostgreSQL database schemas"""
@@ -184,6 +357,7 @@ class DatabaseManager:
             self._init_main_database()
             self._init_notification_database()
             self._create_indexes()
+            self._apply_migrations()
             self._insert_initial_data()
             logger.info("PostgreSQL database schemas initialized successfully")
         except Exception as e:
@@ -224,6 +398,19 @@ class DatabaseManager:
             )
             """,
             
+            # Users-list ordering key, kept by PostgreSQL so it can be indexed directly
+            """
+            ALTER TABLE users ADD COLUMN IF NOT EXISTS sort_key TIMESTAMP
+                GENERATED ALWAYS AS (COALESCE(last_active, created_at)) STORED
+            """,
+            
+            # Word index over phone, email and name for multi-word user search
+            """
+            ALTER TABLE users ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                GENERATED ALWAYS AS (to_tsvector('simple',
+                    phone_number || ' ' || COALESCE(email, '') || ' ' || COALESCE(full_name, ''))) STORED
+            """,
+            
             # Tasks table
             """
             CREATE TABLE IF NOT EXISTS tasks (
@@ -272,6 +459,23 @@ class DatabaseManager:
             )
             """,
             
+            # Daily task rollup backing the admin analytics (refreshed by admin_dashboard)
+            """
+            CREATE TABLE IF NOT EXISTS daily_task_stats (
+                day DATE NOT NULL,
+                category VARCHAR(50) NOT NULL DEFAULT '',
+                tier VARCHAR(20) NOT NULL DEFAULT '',
+                total_tasks INTEGER NOT NULL DEFAULT 0,
+                successful_tasks INTEGER NOT NULL DEFAULT 0,
+                timed_tasks INTEGER NOT NULL DEFAULT 0,
+                sum_processing_time DOUBLE PRECISION NOT NULL DEFAULT 0,
+                scored_tasks INTEGER NOT NULL DEFAULT 0,
+                sum_complexity DOUBLE PRECISION NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT NOW(),
+                PRIMARY KEY (day, category, tier)
+            )
+            """,
+            
             # Database version table
             """
             CREATE TABLE IF NOT EXISTS db_version (
@@ -294,7 +498,34 @@ class DatabaseManager:
                 quiet_hours_end INTEGER CHECK (quiet_hours_end >= 0 AND quiet_hours_end <= 23),
                 updated_at TIMESTAMP DEFAULT NOW()
             )
+            """,
+            
+            # Hourly rollups for the dashboard trend charts, limited to the
+            # last two days so the periodic refresh stays cheap
             """
+            CREATE MATERIALIZED VIEW IF NOT EXISTS tasks_hourly AS
+            SELECT 
+                DATE_TRUNC('hour', created_at) as hour,
+                COUNT(*) as task_count,
+                COALESCE(AVG(processing_time), 0) as avg_processing_time,
+                COUNT(*) FILTER (WHERE processing_time > 10) as slow_tasks
+            FROM tasks
+            WHERE created_at >= DATE_TRUNC('hour', NOW()) - INTERVAL '48 hours'
+            GROUP BY 1
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_hourly_hour ON tasks_hourly(hour)",
+            
+            """
+            CREATE MATERIALIZED VIEW IF NOT EXISTS error_logs_hourly AS
+            SELECT 
+                DATE_TRUNC('hour', timestamp) as hour,
+                COUNT(*) as error_count,
+                COUNT(DISTINCT error_type) as unique_error_types
+            FROM error_logs
+            WHERE timestamp >= DATE_TRUNC('hour', NOW()) - INTERVAL '48 hours'
+            GROUP BY 1
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_error_logs_hourly_hour ON error_logs_hourly(hour)"
         ]
         
         with self.get_cursor('main') as cursor:
@@ -392,11 +623,31 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_users_tier ON users(tier)",
             "CREATE INDEX IF NOT EXISTS idx_users_last_active ON users(last_active)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_user_phone ON tasks(user_phone)",
-            "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_success ON tasks(success)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_user_created ON tasks(user_phone, created_at)",
-            "CREATE INDEX IF NOT EXISTS idx_error_logs_timestamp ON error_logs(timestamp)",
+            # Covering indexes let the date-range analytics run as index-only scans
+            "CREATE INDEX IF NOT EXISTS idx_tasks_created_covering ON tasks(created_at) "
+            "INCLUDE (success, processing_time, tokens_used, complexity_score, category, user_phone)",
+            # tasks is append-only, so a tiny BRIN index prunes wide created_at ranges
+            # (30-day analytics, rollup rebuilds) without the size of another B-tree
+            "CREATE INDEX IF NOT EXISTS idx_tasks_created_at_brin ON tasks USING BRIN (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at)",
+            # Matches the users-list ORDER BY so keyset pages are index range scans
+            "CREATE INDEX IF NOT EXISTS idx_users_sort_key ON users (sort_key DESC, phone_number DESC)",
+            # Trigram indexes let the users-list ILIKE '%term%' search use a bitmap index scan;
+            # the email/name expressions must match the COALESCE(...) in the search predicate
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            # Optional: approximate percentiles for the task analytics (skipped when not installed)
+            "CREATE EXTENSION IF NOT EXISTS tdigest",
+            # Optional: approximate distinct active-user counts (skipped when not installed)
+            "CREATE EXTENSION IF NOT EXISTS hll",
+            "CREATE INDEX IF NOT EXISTS idx_users_phone_trgm ON users USING GIN (phone_number gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS idx_users_email_trgm ON users USING GIN ((COALESCE(email, '')) gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS idx_users_name_trgm ON users USING GIN ((COALESCE(full_name, '')) gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS idx_users_search_tsv ON users USING GIN (search_tsv)",
+            "CREATE INDEX IF NOT EXISTS idx_error_logs_timestamp_covering ON error_logs(timestamp) "
+            "INCLUDE (error_type, user_phone)",
             "CREATE INDEX IF NOT EXISTS idx_error_logs_type ON error_logs(error_type)",
             "CREATE INDEX IF NOT EXISTS idx_system_metrics_timestamp ON system_metrics(timestamp)",
             "CREATE INDEX IF NOT EXISTS idx_system_metrics_name ON system_metrics(metric_name)",
@@ -412,6 +663,10 @@ class DatabaseManager:
         ]
         
         # Create main database indexes
+        with self.get_cursor('main') as cursor:
+            cursor.execute("SELECT COUNT(*) AS count FROM pg_indexes WHERE schemaname = current_schema()")
+            indexes_before = cursor.fetchone()['count']
+        
         for index_query in main_indexes:
             try:
                 with self.get_cursor('main') as cursor:
@@ -419,6 +674,18 @@ class DatabaseManager:
             except Exception as e:
                 logger.warning(f"Failed to create main index: {e}")
         
+        # Refresh planner statistics once new indexes exist so the
+        # multi-column ones are actually chosen for the analytics queries
+        try:
+            with self.get_cursor('main') as cursor:
+                cursor.execute("SELECT COUNT(*) AS count FROM pg_indexes WHERE schemaname = current_schema()")
+                if cursor.fetchone()['count'] != indexes_before:
+                    cursor.execute("ANALYZE users")
+                    cursor.execute("ANALYZE tasks")
+                    cursor.execute("ANALYZE error_logs")
+        except Exception as e:
+            logger.warning(f"Failed to analyze main tables: {e}")
+        
         # Create notification database indexes
         for index_query in notification_indexes:
             try:
@@ -427,6 +694,23 @@ class DatabaseManager:
             except Exception as e:
                 logger.warning(f"Failed to create notification index: {e}")
     
+    def _apply_migrations(self):
+        """Run the SCHEMA_MIGRATIONS newer than the recorded db_version, once"""
+        with self.get_cursor('main') as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_MIGRATION_LOCK_ID,))
+            cursor.execute("SELECT COALESCE(MAX(version), 1) AS version FROM db_version")
+            current = cursor.fetchone()['version']
+            for version, notes, statements in SCHEMA_MIGRATIONS:
+                if version <= current:
+                    continue
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(
+                    "INSERT INTO db_version (version, migration_notes) VALUES (%s, %s)",
+                    (version, notes)
+                )
+                logger.info(f"Applied schema migration {version}: {notes}")
+    
     def _insert_initial_data(self):
         """Insert initial data for system functionality"""
         # Insert database version
@@ -572,6 +856,30 @@ class DatabaseManager:
         
         return health
     
+    def has_extension(self, name: str) -> bool:
+        """Check whether a PostgreSQL extension is installed in the main database"""
+        try:
+            result = self.execute_query(
+                "SELECT 1 FROM pg_extension WHERE extname = %s", (name,), fetch='one'
+            )
+            return result is not None
+        except Exception as e:
+            logger.warning(f"Could not check for extension {name}: {e}")
+            return False
+    
+    def pool_stats(self, db_type: str = 'main') -> Dict[str, int]:
+        """Report connection counts from the local pool without querying the server"""
+        pool = self.main_pool if db_type == 'main' else self.notification_pool
+        with pool._lock:
+            active = len(pool._used)
+            idle = len(pool._pool)
+        return {
+            'total_connections': active + idle,
+            'active_connections': active,
+            'idle_connections': idle,
+            'max_connections': pool.maxconn
+        }
+    
     def close_pools(self):
         """Close connection pools gracefully"""
         try:
@@ -586,18 +894,25 @@ class DatabaseManager:
 
 # Global database manager instance
 db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
 
 def get_database_manager() -> DatabaseManager:
     """Get global PostgreSQL database manager instance"""
     global db_manager
     if db_manager is None:
-        database_url = os.environ.get('DATABASE_URL')
-        notification_db_url = os.environ.get('NOTIFICATION_DB_URL')
-        pool_size = int(os.environ.get('DB_POOL_SIZE', '10'))
-        db_manager = DatabaseManager(database_url, notification_db_url, pool_size)
+        # Only one thread may build the pools and run the schema setup
+        with _db_manager_lock:
+            if db_manager is None:
+                database_url = os.environ.get('DATABASE_URL')
+                notification_db_url = os.environ.get('NOTIFICATION_DB_URL')
+                pool_size = int(os.environ.get('DB_POOL_SIZE', DEFAULT_POOL_SIZE))
+                min_pool_size = os.environ.get('DB_POOL_MIN_SIZE')
+                db_manager = DatabaseManager(database_url, notification_db_url, pool_size,
+                                             int(min_pool_size) if min_pool_size else None)
     return db_manager
 
-def init_database_manager(database_url: str = None, notification_db_url: str = None, pool_size: int = 10):
+def init_database_manager(database_url: str = None, notification_db_url: str = None, pool_size: int = 10,
+                          min_pool_size: int = None):
     """Initialize global PostgreSQL database manager with specific configuration"""
     global db_manager
-    db_manager = DatabaseManager(database_url, notification_db_url, pool_size) 
\ No newline at end of file
+    db_manager = DatabaseManager(database_url, notification_db_url, pool_size, min_pool_size) 
\ No newline at end of file
@@ -32,11 +32,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'admin_dashboard.middleware.AdminAuthMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -196,6 +198,21 @@ OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 
 REDIS_URL = os.environ.get('REDIS_URL', 'redis://redis:6379/0')
 
+# Shared cache for dashboard aggregates and template fragments
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'sms_agent',
+    }
+}
+
+# Serve sessions from the cache so admin polling rarely queries the session
+# table; they are written through to the database, so a Redis restart or
+# eviction does not log everyone out
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+
 # Rate limiting settings
 RATE_LIMIT_FREE = int(os.environ.get('RATE_LIMIT_FREE', '10'))
 RATE_LIMIT_PREMIUM = int(os.environ.get('RATE_LIMIT_PREMIUM', '100'))